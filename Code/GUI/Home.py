@@ -12,6 +12,62 @@ from qfluentwidgets import (
 
 from Code.GUI.Workers import SMTWorker
 
+# (accent color, description) per mode; index matches the slider value
+MODE_STYLES = (
+    ("#107C10", "Fast (Single Solution)"),
+    ("#00629B", "Pro (All Valid Solutions)"),
+    ("#FF8C00", "Ultra (Cost Optimization)"),
+)
+
+def _button_style(color_hex):
+    return f"""
+        PrimaryPushButton {{
+            background-color: {color_hex};
+            border: 1px solid {color_hex};
+            border-radius: 6px;
+            color: white;
+            height: 40px;
+            font-size: 16px;
+            font-weight: bold;
+            font-family: 'Segoe UI', sans-serif;
+        }}
+        PrimaryPushButton:hover {{
+            background-color: {color_hex}; 
+            border: 1px solid {color_hex};
+        }}
+        PrimaryPushButton:pressed {{
+            background-color: {color_hex};
+            opacity: 0.8;
+        }}
+        PrimaryPushButton:disabled {{
+            background-color: {color_hex};
+            opacity: 0.5; 
+            border: 1px solid {color_hex};
+            color: rgba(255, 255, 255, 0.8);
+        }}
+    """
+
+def _slider_style(color_hex):
+    return f"""
+        Slider::groove:horizontal {{
+            height: 4px; 
+            background: #cccccc;
+            border-radius: 2px;
+        }}
+        Slider::handle:horizontal {{
+            background: {color_hex};
+            border: 2px solid {color_hex};
+            width: 18px;
+            height: 18px;
+            border-radius: 10px;
+            margin: -7px 0;
+        }}
+        Slider::sub-page:horizontal {{
+            background: {color_hex};
+            border-radius: 2px;
+        }}
+    """
+
 class ZoneSlider(Slider):
     def mousePressEvent(self, event):
         if self.orientation() == Qt.Orientation.Horizontal:
@@ -33,6 +89,7 @@ class HomePage(QWidget):
         self.settings_page = settings_page
         self.recipe_path = ""
         self.resource_dir = ""
+        self._results_page = None
         
         setThemeColor("#00629B")
         
@@ -134,10 +191,15 @@ class HomePage(QWidget):
 
         self.pbar = QProgressBar(self)
         self.pbar.setValue(0)
+        self._pbar_max = self.pbar.maximum()
+        self._pbar_val = 0
         layout.addWidget(self.pbar)
         
         layout.addStretch()
         
+        # Stylesheets are built once; the slider only switches between them
+        self._btn_styles = [_button_style(c) for c, _ in MODE_STYLES]
+        self._slider_styles = [_slider_style(c) for c, _ in MODE_STYLES]
         self.update_ui_state(0)
 
     def update_ui_state(self, val):
@@ -147,82 +209,42 @@ class HomePage(QWidget):
         if self.settings_page:
             self.settings_page.set_weights_visible(val == 2)
 
-        if val == 0: 
-            color_hex = "#107C10" 
-            desc = "Fast (Single Solution)"
-        elif val == 1: 
-            color_hex = "#00629B"
-            desc = "Pro (All Valid Solutions)"
-        else: 
-            color_hex = "#FF8C00" 
-            desc = "Ultra (Cost Optimization)"
+        color_hex, desc = MODE_STYLES[val]
 
         self.lbl_opts_desc.setText(desc)
         self.btn_run.setText(f"Start Calculation in {mode_text} Mode")
-        
-        btn_style = f"""
-            PrimaryPushButton {{
-                background-color: {color_hex};
-                border: 1px solid {color_hex};
-                border-radius: 6px;
-                color: white;
-                height: 40px;
-                font-size: 16px;
-                font-weight: bold;
-                font-family: 'Segoe UI', sans-serif;
-            }}
-            PrimaryPushButton:hover {{
-                background-color: {color_hex}; 
-                border: 1px solid {color_hex};
-            }}
-            PrimaryPushButton:pressed {{
-                background-color: {color_hex};
-                opacity: 0.8;
-            }}
-            PrimaryPushButton:disabled {{
-                background-color: {color_hex};
-                opacity: 0.5; 
-                border: 1px solid {color_hex};
-                color: rgba(255, 255, 255, 0.8);
-            }}
-        """
-        self.btn_run.setStyleSheet(btn_style)
+        self.btn_run.setStyleSheet(self._btn_styles[val])
         
         # [NEW] Notify Results Page about color change
-        main_win = self.window()
-        if isinstance(main_win, FluentWindow) and hasattr(main_win, 'results_page'):
-            main_win.results_page.set_export_button_color(color_hex)
+        results_page = self._get_results_page()
+        if results_page:
+            results_page.set_export_button_color(color_hex)
         
-        slider_style = f"""
-            Slider::groove:horizontal {{
-                height: 4px; 
-                background: #cccccc;
-                border-radius: 2px;
-            }}
-            Slider::handle:horizontal {{
-                background: {color_hex};
-                border: 2px solid {color_hex};
-                width: 18px;
-                height: 18px;
-                border-radius: 10px;
-                margin: -7px 0;
-            }}
-            Slider::sub-page:horizontal {{
-                background: {color_hex};
-                border-radius: 2px;
-            }}
-        """
-        self.slider_mode.setStyleSheet(slider_style)
+        self.slider_mode.setStyleSheet(self._slider_styles[val])
+
+    def _get_results_page(self):
+        # Resolved lazily and cached; the slider calls update_ui_state on every drag step
+        if self._results_page is None:
+            main_win = self.window()
+            if isinstance(main_win, FluentWindow) and hasattr(main_win, 'results_page'):
+                self._results_page = main_win.results_page
+        return self._results_page
 
     def select_recipe(self):
-        f, _ = QFileDialog.getOpenFileName(self, "Select Recipe XML", os.getcwd(), "XML Files (*.xml)")
+        f, _ = QFileDialog.getOpenFileName(
+            self, "Select Recipe XML", os.getcwd(), "XML Files (*.xml)",
+            options=self.settings_page.get_dialog_options()
+        )
         if f:
             self.recipe_path = f
             self.lbl_recipe_val.setText(os.path.basename(f))
             self.check_ready()
 
     def select_folder(self):
-        d = QFileDialog.getExistingDirectory(self, "Select Resources Folder", os.getcwd())
+        d = QFileDialog.getExistingDirectory(
+            self, "Select Resources Folder", os.getcwd(),
+            self.settings_page.get_dialog_options(directory=True)
+        )
         if d:
             self.resource_dir = d
             self.lbl_res_val.setText(d)
@@ -241,17 +263,27 @@ class HomePage(QWidget):
         
         self.worker = SMTWorker(self.recipe_path, self.resource_dir, mode, weights)
         self.worker.log_signal.connect(self.log_callback)
-        self.worker.progress_signal.connect(lambda c, t: (self.pbar.setMaximum(t), self.pbar.setValue(c)))
+        self.worker.progress_signal.connect(self._on_progress)
         self.worker.error_signal.connect(lambda e: InfoBar.error(title="Error", content=e, parent=self.window()))
         self.worker.finished_signal.connect(self.on_finished)
         self.worker.start()
 
-    def on_finished(self, results, context_data):
+    def _on_progress(self, current, total):
+        # Only touch the bar when something changed; every setter triggers a repaint
+        if total != self._pbar_max:
+            self.pbar.setMaximum(total)
+            self._pbar_max = total
+        if current != self._pbar_val:
+            self.pbar.setValue(current)
+            self._pbar_val = current
+
+    def on_finished(self, results, context_data, has_score):
         self.btn_run.setEnabled(True)
-        main = self.window()
-        if isinstance(main, FluentWindow):
-            if hasattr(main, 'results_page') and hasattr(main, 'switchTo'):
+        results_page = self._get_results_page()
+        if results_page:
+            main = self.window()
+            if hasattr(main, 'switchTo'):
                 # Pass both gui data and context data
-                main.results_page.set_data(results, context_data)
-                main.switchTo(main.results_page)
+                results_page.set_data(results, context_data, has_score)
+                main.switchTo(results_page)
                 InfoBar.success(title="Completed", content=f"Calculation finished.", parent=main, position=InfoBarPosition.TOP_RIGHT)
\ No newline at end of file
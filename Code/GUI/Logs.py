@@ -1,8 +1,14 @@
 # Code/GUI/Logs.py
+from typing import List
+
 from PyQt6.QtWidgets import QWidget, QVBoxLayout
 from PyQt6.QtGui import QTextCursor
 from qfluentwidgets import TextEdit, SubtitleLabel
 
+# Oldest lines are dropped once the log exceeds this many blocks
+MAX_LOG_BLOCKS = 5000
+
+
 class LogPage(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -11,9 +17,17 @@ class LogPage(QWidget):
         self.title = SubtitleLabel("Execution Log", self)
         self.log_edit = TextEdit(self)
         self.log_edit.setReadOnly(True)
+        self.log_edit.document().setMaximumBlockCount(MAX_LOG_BLOCKS)
         layout.addWidget(self.title)
         layout.addWidget(self.log_edit, 1)
 
     def append_log(self, msg: str):
         self.log_edit.append(msg)
+        self.log_edit.moveCursor(QTextCursor.MoveOperation.End)
+
+    def append_logs(self, msgs: List[str]):
+        """Append a batch of lines with a single document update."""
+        if not msgs:
+            return
+        self.log_edit.append("\n".join(msgs))
         self.log_edit.moveCursor(QTextCursor.MoveOperation.End)
\ No newline at end of file
@@ -1,39 +1,235 @@
 # Code/GUI/Results.py
 import os
-from typing import List, Dict
+from typing import List, Dict, Optional, Set, Tuple
 
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QColor
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QSignalBlocker
+from PyQt6.QtGui import QColor, QBrush
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QTableWidgetItem, QHeaderView,
+    QWidget, QVBoxLayout, QHeaderView,
     QHBoxLayout, QFileDialog
 )
 from qfluentwidgets import (
-    TableWidget, SubtitleLabel, PrimaryPushButton, PushButton,
-    InfoBar, InfoBarPosition
+    TableView, TableItemDelegate, SubtitleLabel, PrimaryPushButton, PushButton,
+    InfoBar, InfoBarPosition, isDarkTheme, qconfig
 )
 
-# Import Generator
-from Code.Transformator.MasterRecipeGenerator import generate_b2mml_master_recipe
+from Code.GUI.Settings import FILE_DIALOG_OPTIONS
 
 # Validation helpers
-from Code.GUI.Workers import validate_master_recipe_xml, validate_master_recipe_parameters
+from Code.GUI.Workers import (
+    ResourceParseWorker, ParameterValidationWorker, ValidationWorker,
+    TableFormatWorker, format_table_cells
+)
+
+
+_DISPLAY_ROLE = Qt.ItemDataRole.DisplayRole
+_FOREGROUND_ROLE = Qt.ItemDataRole.ForegroundRole
+_NO_FLAGS = Qt.ItemFlag.NoItemFlags
+
+# Row heights (px); rows are fixed height instead of measured per content
+ROW_HEIGHT = 38
+SEPARATOR_HEIGHT = 24
+
+# Initial column widths (px) per table mode; Capabilities is stretched anyway
+SCORE_COLUMN_WIDTHS = (60, 80, 140, 300, 180, 200, 80, 80, 80)
+PLAIN_COLUMN_WIDTHS = (60, 140, 300, 180, 200, 100)
+
+# Result sets at least this large are formatted in a TableFormatWorker
+ASYNC_FORMAT_MIN_ROWS = 2000
+
+# Bound formatters, resolved once instead of per cell
+_fmt_2f = "{:.2f}".format
+_fmt_1f = "{:.1f}".format
+
+
+def _insert_separators(rows: List[Dict]) -> Tuple[List[Dict], Set[int]]:
+    """
+    Single pass over rows: drop empty input rows and insert an empty dict
+    wherever solution_id changes. Also returns the separator row indices so
+    callers do not need a second walk to find them.
+    """
+    display_data: List[Dict] = []
+    separator_rows: Set[int] = set()
+    prev_sid = None
+    for row in rows:
+        if not row:
+            continue
+        sid = row.get("solution_id", None)
+        if prev_sid is not None and sid is not None and sid != prev_sid:
+            separator_rows.add(len(display_data))
+            display_data.append({})  # separator marker
+        display_data.append(row)
+        prev_sid = sid
+    return display_data, separator_rows
+
+
+class ResultsTableModel(QAbstractTableModel):
+    """
+    Model behind the results table.
+    Rows are kept as the dicts produced by SMTWorker; their display strings
+    are formatted once, in set_rows or beforehand by the caller. Empty dicts
+    are separator rows.
+    """
+
+    SCORE_HEADERS = ["Sol ID", "Score", "Step", "Description", "Resource", "Capabilities", "Energy", "Use", "CO2"]
+    SCORE_KEYS = ("solution_id", "composite_score", "step_id", "description", "resource",
+                  "capabilities", "energy_cost", "use_cost", "co2_footprint")
+    PLAIN_HEADERS = ["Sol ID", "Step", "Description", "Resource", "Capabilities", "Status"]
+    PLAIN_KEYS = ("solution_id", "step_id", "description", "resource", "capabilities", "status")
+
+    # (key, formatter, default) per column
+    SCORE_SPEC = tuple(zip(
+        SCORE_KEYS,
+        (str, _fmt_2f, str, str, str, str, _fmt_1f, _fmt_1f, _fmt_1f),
+        ("", 0, "", "", "", "", 0, 0, 0),
+    ))
+    PLAIN_SPEC = tuple((key, str, "") for key in PLAIN_KEYS)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows: List[Dict] = []
+        self._cells: List[Optional[Tuple[str, ...]]] = []
+        self._separator_rows: Set[int] = set()
+        self._has_score = False
+        self._headers = self.PLAIN_HEADERS
+        self._status_brush = QBrush(QColor("#28a745"))
+
+    @classmethod
+    def spec_for(cls, has_score: bool):
+        return cls.SCORE_SPEC if has_score else cls.PLAIN_SPEC
+
+    def set_rows(self, rows: List[Dict], separator_rows: Set[int], has_score: bool,
+                 cells: Optional[List[Optional[Tuple[str, ...]]]] = None):
+        """cells may be pre-formatted with format_table_cells(rows, spec_for(has_score))."""
+        if cells is None:
+            cells = format_table_cells(rows, self.spec_for(has_score))
+        self.beginResetModel()
+        self._rows = rows
+        self._separator_rows = separator_rows
+        self._has_score = has_score
+        self._headers = self.SCORE_HEADERS if has_score else self.PLAIN_HEADERS
+        self._cells = cells
+        self.endResetModel()
+
+    def separator_rows(self) -> Set[int]:
+        return self._separator_rows
+
+    def is_separator(self, row: int) -> bool:
+        return row in self._separator_rows
+
+    def solution_id_text(self, row: int) -> str:
+        if row < 0 or row >= len(self._rows) or not self._rows[row]:
+            return ""
+        return str(self._rows[row].get('solution_id', ''))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._headers)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self._headers[section]
+        return None
+
+    def flags(self, index):
+        if index.isValid() and not self._rows[index.row()]:
+            return _NO_FLAGS
+        return super().flags(index)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        # The delegate queries many roles per cell; answer only the two we use.
+        # Separator backgrounds are painted by SeparatorDelegate.
+        if role == _DISPLAY_ROLE:
+            cells = self._cells[index.row()]
+            return cells[index.column()] if cells else None
+        if role == _FOREGROUND_ROLE:
+            if not self._has_score and index.column() == 5 and self._rows[index.row()]:
+                return self._status_brush
+        return None
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        """Sort by the displayed text of a column; separators are rebuilt afterwards."""
+        if column < 0 or not self._rows:
+            return
+        pairs = [(cells, r) for r, cells in zip(self._rows, self._cells) if cells]
+        pairs.sort(key=lambda p: p[0][column], reverse=(order == Qt.SortOrder.DescendingOrder))
+        rows = [r for _, r in pairs]
+        display_data, separator_rows = _insert_separators(rows)
+        # Rows keep their formatted cells; only separator slots are new
+        sorted_cells = iter([cells for cells, _ in pairs])
+        cells = [next(sorted_cells) if r else None for r in display_data]
+        self.set_rows(display_data, separator_rows, self._has_score, cells)
+
+
+class SeparatorDelegate(TableItemDelegate):
+    """
+    Paints separator rows as a plain colour band.
+    Separator rows have no cell content, so the fluent hover/selection
+    background and text drawing are skipped for them entirely.
+    """
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.separator_brush = QBrush(QColor("#f3f3f3"))
 
-# For on-demand parsing if no cached resources exist
-try:
-    from Code.SMT4ModPlant.AASxmlCapabilityParser import parse_capabilities_robust
-except Exception:
-    parse_capabilities_robust = None
+    def set_separator_color(self, color: QColor):
+        self.separator_brush = QBrush(color)
+
+    def paint(self, painter, option, index):
+        if index.model().is_separator(index.row()):
+            painter.fillRect(option.rect, self.separator_brush)
+            return
+        super().paint(painter, option, index)
 
 
 class ResultsPage(QWidget):
+    _EXPORT_STYLE_TEMPLATE = """
+        PrimaryPushButton {
+            background-color: %(c)s;
+            border: 1px solid %(c)s;
+            border-radius: 6px;
+            color: white;
+        }
+        PrimaryPushButton:hover {
+            background-color: %(c)s;
+            opacity: 0.9;
+        }
+        PrimaryPushButton:pressed {
+            background-color: %(c)s;
+            opacity: 0.8;
+        }
+        PrimaryPushButton:disabled {
+            background-color: #cccccc;
+            border: 1px solid #cccccc;
+            color: #666666;
+        }
+    """
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setObjectName("results_page")
 
         # Store context data for export
         self.context_data = None
+        # window() walks the parent chain; resolved lazily and cached
+        self._cached_main = None
+        self._settings_page_ref = None
+        # Generator / AAS parser are imported on first use to keep GUI startup light
+        self._gen = None
+        self._parser = None
+        # (resources_data, (uuid_index, warnings)) from the last parameter validation
+        self._param_index = None
+        # (resource_dir, signature, resources_data) from the last on-demand parse
+        self._dir_resources = None
+        # allschema folder -> root XSD picked for it
+        self._schema_roots: Dict[str, str] = {}
         self.current_color_hex = "#107C10"  # Default Green
+        self._applied_color = None  # colour of the stylesheet currently on btn_export
+        self._format_worker = None
+        # superseded format workers, kept referenced while their thread runs
+        self._retired_format_workers = []
 
         layout = QVBoxLayout(self)
 
@@ -60,93 +256,110 @@ class ResultsPage(QWidget):
         header_layout.addWidget(self.btn_param_validate)
         header_layout.addWidget(self.btn_export)
 
-        self.table = TableWidget(self)
+        self.model = ResultsTableModel(self)
+        self._sized_separator_rows: Set[int] = set()
+        self.model.modelReset.connect(lambda: self.btn_export.setEnabled(False))
+        # Separator heights live on the view; re-apply them after every reset (fill or sort)
+        self.model.modelReset.connect(self._apply_separator_heights)
+
+        self.table = TableView(self)
+        self.table.setModel(self.model)
+        self.separator_delegate = SeparatorDelegate(self.table)
+        self.table.setItemDelegate(self.separator_delegate)
+        self._update_separator_color()
+        qconfig.themeChanged.connect(self._update_separator_color)
         self.table.verticalHeader().setVisible(False)
+        # Fixed row heights: no per-row measuring of cell contents
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(ROW_HEIGHT)
         self.table.setBorderVisible(True)
         self.table.setWordWrap(True)
 
-
-        try:
-            self.table.setUniformRowHeights(False)
-        except Exception:
-            pass
-
         # Enable row selection
-        self.table.setSelectionBehavior(TableWidget.SelectionBehavior.SelectRows)
-        self.table.setSelectionMode(TableWidget.SelectionMode.SingleSelection)
-        self.table.itemSelectionChanged.connect(self.on_selection_changed)
+        self.table.setSelectionBehavior(TableView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(TableView.SelectionMode.SingleSelection)
+        self.table.selectionModel().currentRowChanged.connect(self._on_current_row_changed)
 
         layout.addLayout(header_layout)
         layout.addWidget(self.table, 1)
 
+    def _update_separator_color(self, *args):
+        """Resolve the separator colour once per theme instead of per table update."""
+        sep_bg = QColor("#f3f3f3")
+        try:
+            if isDarkTheme():
+                sep_bg = QColor("#2a2a2a")
+        except Exception:
+            pass
+        self.separator_delegate.set_separator_color(sep_bg)
+        self.table.viewport().update()
+
+    def _apply_separator_heights(self):
+        # The header syncs its section count lazily after a reset; force it so
+        # the heights below are not dropped
+        self.table.verticalHeader().doItemsLayout()
+        # Sections keep their custom sizes across a reset, so undo the last
+        # separators before sizing the new ones
+        # Also runs after header-click sorts, outside update_table's guard, so
+        # hold repaints until all rows are sized
+        was_enabled = self.table.updatesEnabled()
+        self.table.setUpdatesEnabled(False)
+        try:
+            row_count = self.model.rowCount()
+            for r in self._sized_separator_rows:
+                if r < row_count:
+                    self.table.setRowHeight(r, ROW_HEIGHT)
+            self._sized_separator_rows = set(self.model.separator_rows())
+            for r in self._sized_separator_rows:
+                self.table.setRowHeight(r, SEPARATOR_HEIGHT)
+        finally:
+            self.table.setUpdatesEnabled(was_enabled)
+
     def set_export_button_color(self, color_hex):
         """Called by Home to sync color"""
         self.current_color_hex = color_hex
         self.update_button_style()
 
     def update_button_style(self):
-        style = f"""
-            PrimaryPushButton {{
-                background-color: {self.current_color_hex};
-                border: 1px solid {self.current_color_hex};
-                border-radius: 6px;
-                color: white;
-            }}
-            PrimaryPushButton:hover {{
-                background-color: {self.current_color_hex};
-                opacity: 0.9;
-            }}
-            PrimaryPushButton:pressed {{
-                background-color: {self.current_color_hex};
-                opacity: 0.8;
-            }}
-            PrimaryPushButton:disabled {{
-                background-color: #cccccc;
-                border: 1px solid #cccccc;
-                color: #666666;
-            }}
-        """
-        self.btn_export.setStyleSheet(style)
+        # Re-applying an unchanged stylesheet still makes Qt re-parse and re-polish
+        if self.current_color_hex == self._applied_color:
+            return
+        self.btn_export.setStyleSheet(self._EXPORT_STYLE_TEMPLATE % {'c': self.current_color_hex})
+        self._applied_color = self.current_color_hex
 
-    def set_data(self, gui_data: List[Dict], context_data: Dict):
+    def set_data(self, gui_data: List[Dict], context_data: Dict, has_score: Optional[bool] = None):
         """Receive data from Home"""
         self.context_data = context_data
-        self.update_table(gui_data)
+        # Reuse the UUID index the SMT worker built for these resources
+        index = context_data.get('resources_index') if isinstance(context_data, dict) else None
+        if index is not None:
+            self._param_index = (context_data.get('resources'), index)
+        self.update_table(gui_data, has_score)
         self.btn_export.setEnabled(False)
 
-    def on_selection_changed(self):
-        selected_items = self.table.selectedItems()
-        if not selected_items:
-            self.btn_export.setEnabled(False)
-            return
+    def _solution_id_at(self, row: int) -> Optional[int]:
+        if row < 0:
+            return None
+        sol_id_text = self.model.solution_id_text(row)
+        if not sol_id_text.isdigit():
+            return None
+        return int(sol_id_text)
 
-        row = selected_items[0].row()
-        item = self.table.item(row, 0)  # Col 0 is Sol ID
+    def _selected_solution_id(self) -> Optional[int]:
+        return self._solution_id_at(self.table.selectionModel().currentIndex().row())
 
-        if item and item.text().isdigit():
-            self.btn_export.setEnabled(True)
-        else:
-            self.btn_export.setEnabled(False)
+    def _on_current_row_changed(self, current: QModelIndex, previous: QModelIndex):
+        self.btn_export.setEnabled(self._solution_id_at(current.row()) is not None)
 
     def export_solution(self):
-        selected_items = self.table.selectedItems()
-        if not selected_items:
-            return
-
-        row = selected_items[0].row()
-        sol_id_item = self.table.item(row, 0)
-        if not sol_id_item:
+        sol_id = self._selected_solution_id()
+        if sol_id is None:
             return
 
-        sol_id_text = sol_id_item.text()
-        if not sol_id_text.isdigit():
-            return
-        sol_id = int(sol_id_text)
-
-        main_win = self.window()
+        settings_page = self._settings_page
         save_dir = ""
-        if hasattr(main_win, 'settings_page'):
-            save_dir = main_win.settings_page.get_export_path()
+        if settings_page is not None:
+            save_dir = settings_page.get_export_path()
         else:
             save_dir = os.path.expanduser("~/Downloads")
 
@@ -160,7 +373,10 @@ class ResultsPage(QWidget):
         full_path = os.path.join(save_dir, filename)
 
         try:
-            generate_b2mml_master_recipe(
+            if self._gen is None:
+                from Code.Transformator.MasterRecipeGenerator import generate_b2mml_master_recipe
+                self._gen = generate_b2mml_master_recipe
+            self._gen(
                 resources_data=self.context_data['resources'],
                 solutions_data_list=self.context_data['solutions'],
                 general_recipe_data=self.context_data['recipe'],
@@ -175,7 +391,7 @@ class ResultsPage(QWidget):
                 isClosable=True,
                 position=InfoBarPosition.TOP_RIGHT,
                 duration=5000,
-                parent=self.window()
+                parent=self._main
             )
         except Exception as e:
             import traceback
@@ -186,23 +402,57 @@ class ResultsPage(QWidget):
                 orient=Qt.Orientation.Horizontal,
                 isClosable=True,
                 position=InfoBarPosition.TOP_RIGHT,
-                parent=self.window()
+                parent=self._main
             )
 
     # =========================
     # Master Recipe Validation
     # =========================
-    def _append_log(self, msg: str):
-        main = self.window()
+    @property
+    def _main(self):
+        """Top-level window; cached once the page is embedded in it."""
+        if self._cached_main is None:
+            win = self.window()
+            if win is self:
+                return win  # not embedded yet, resolve again next time
+            self._cached_main = win
+        return self._cached_main
+
+    @property
+    def _settings_page(self):
+        if self._settings_page_ref is None:
+            self._settings_page_ref = getattr(self._main, 'settings_page', None)
+        return self._settings_page_ref
+
+    def _dialog_options(self, directory: bool = False):
+        settings_page = self._settings_page
+        if settings_page is not None:
+            return settings_page.get_dialog_options(directory)
+        if directory:
+            return FILE_DIALOG_OPTIONS | QFileDialog.Option.ShowDirsOnly
+        return FILE_DIALOG_OPTIONS
+
+    def _log_target(self):
+        """Resolve the log sink once so callers can log in loops without window() walks."""
+        main = self._main
         if hasattr(main, 'log_page') and hasattr(main.log_page, 'append_log'):
-            main.log_page.append_log(msg)
+            return main.log_page.append_log
+        return lambda msg: None
+
+    def _append_log(self, msg: str):
+        self._log_target()(msg)
+
+    def _append_logs(self, msgs: List[str]):
+        main = self._main
+        if hasattr(main, 'log_page') and hasattr(main.log_page, 'append_logs'):
+            main.log_page.append_logs(msgs)
 
     def validate_master_recipe(self):
-        main = self.window()
+        settings_page = self._settings_page
         start_dir = os.path.expanduser("~/Downloads")
-        if hasattr(main, 'settings_page'):
+        if settings_page is not None:
             try:
-                d = main.settings_page.get_export_path()
+                d = settings_page.get_export_path()
                 if d and os.path.isdir(d):
                     start_dir = d
             except Exception:
@@ -212,7 +462,8 @@ class ResultsPage(QWidget):
             self,
             "Select Master Recipe XML",
             start_dir,
-            "XML Files (*.xml);;All Files (*)"
+            "XML Files (*.xml);;All Files (*)",
+            options=self._dialog_options()
         )
         if not xml_path:
             return
@@ -220,67 +471,93 @@ class ResultsPage(QWidget):
         schema_dir = QFileDialog.getExistingDirectory(
             self,
             "Select allschema Folder (XSD set)",
-            start_dir
+            start_dir,
+            self._dialog_options(directory=True)
         )
         if not schema_dir:
             return
 
-        try:
-            ok, errors, used_root = validate_master_recipe_xml(xml_path, schema_dir, root_xsd_path=None)
-
-            self._append_log(f"[VALIDATION] XML: {xml_path}")
-            self._append_log(f"[VALIDATION] allschema: {schema_dir}")
-            self._append_log(f"[VALIDATION] root XSD used: {used_root}")
-
-            if ok:
-                InfoBar.success(
-                    title="Validation Passed",
-                    content=f"XML conforms to XSD (root: {os.path.basename(used_root)})",
-                    orient=Qt.Orientation.Horizontal,
-                    isClosable=True,
-                    position=InfoBarPosition.TOP_RIGHT,
-                    duration=6000,
-                    parent=self.window()
-                )
-                self._append_log("[VALIDATION] Result: PASSED")
-                return
-
-            preview = " | ".join(errors[:2])
-            more = "" if len(errors) <= 2 else f" (+{len(errors)-2} more)"
-            InfoBar.error(
-                title="Validation Failed",
-                content=f"{preview}{more}",
+        # Reuse the root XSD found for this folder last time; the compiled
+        # schema itself is cached by the validator per (root, mtime)
+        root_xsd = self._schema_roots.get(schema_dir)
+        if root_xsd and not os.path.isfile(root_xsd):
+            root_xsd = None
+
+        # Schema compile + validation can take seconds; keep it off the GUI thread
+        self._set_validation_busy(True)
+        self._validation_worker = ValidationWorker(xml_path, schema_dir, root_xsd)
+        self._validation_worker.finished_signal.connect(
+            lambda *result: self._on_validation_done(xml_path, schema_dir, *result)
+        )
+        self._validation_worker.error_signal.connect(self._on_validation_error)
+        self._validation_worker.start()
+
+    def _set_validation_busy(self, busy: bool):
+        self.btn_validate.setEnabled(not busy)
+        self.btn_validate.setText("Validating..." if busy else "Validate Master Recipe")
+
+    def _on_validation_done(self, xml_path: str, schema_dir: str, ok: bool, errors: List[str], used_root):
+        self._set_validation_busy(False)
+        if used_root:
+            self._schema_roots[schema_dir] = used_root
+
+        lines = [
+            f"[VALIDATION] XML: {xml_path}",
+            f"[VALIDATION] allschema: {schema_dir}",
+            f"[VALIDATION] root XSD used: {used_root}",
+        ]
+
+        if ok:
+            lines.append("[VALIDATION] Result: PASSED")
+            self._append_logs(lines)
+            InfoBar.success(
+                title="Validation Passed",
+                content=f"XML conforms to XSD (root: {os.path.basename(used_root)})",
                 orient=Qt.Orientation.Horizontal,
                 isClosable=True,
                 position=InfoBarPosition.TOP_RIGHT,
-                duration=8000,
-                parent=self.window()
+                duration=6000,
+                parent=self._main
             )
-            self._append_log(f"[VALIDATION] Result: FAILED (errors={len(errors)})")
-            for i, err in enumerate(errors[:50], start=1):
-                self._append_log(f"  {i}. {err}")
+            return
 
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            InfoBar.error(
-                title="Validation Error",
-                content=str(e),
-                orient=Qt.Orientation.Horizontal,
-                isClosable=True,
-                position=InfoBarPosition.TOP_RIGHT,
-                parent=self.window()
-            )
+        lines.append(f"[VALIDATION] Result: FAILED (errors={len(errors)})")
+        lines.extend(f"  {i}. {err}" for i, err in enumerate(errors[:50], start=1))
+        self._append_logs(lines)
+
+        preview = " | ".join(errors[:2])
+        more = "" if len(errors) <= 2 else f" (+{len(errors)-2} more)"
+        InfoBar.error(
+            title="Validation Failed",
+            content=f"{preview}{more}",
+            orient=Qt.Orientation.Horizontal,
+            isClosable=True,
+            position=InfoBarPosition.TOP_RIGHT,
+            duration=8000,
+            parent=self._main
+        )
+
+    def _on_validation_error(self, tb: str):
+        self._set_validation_busy(False)
+        self._append_logs(["[VALIDATION] Exception occurred:", tb])
+        InfoBar.error(
+            title="Validation Error",
+            content=tb.strip().splitlines()[-1] if tb.strip() else "Unknown error",
+            orient=Qt.Orientation.Horizontal,
+            isClosable=True,
+            position=InfoBarPosition.TOP_RIGHT,
+            parent=self._main
+        )
 
     # =========================
     # Parameter Validation
     # =========================
     def validate_parameters(self):
-        main = self.window()
+        settings_page = self._settings_page
         start_dir = os.path.expanduser("~/Downloads")
-        if hasattr(main, 'settings_page'):
+        if settings_page is not None:
             try:
-                d = main.settings_page.get_export_path()
+                d = settings_page.get_export_path()
                 if d and os.path.isdir(d):
                     start_dir = d
             except Exception:
@@ -290,7 +567,8 @@ class ResultsPage(QWidget):
             self,
             "Select Master Recipe XML",
             start_dir,
-            "XML Files (*.xml);;All Files (*)"
+            "XML Files (*.xml);;All Files (*)",
+            options=self._dialog_options()
         )
         if not xml_path:
             return
@@ -300,72 +578,123 @@ class ResultsPage(QWidget):
             resources_data = self.context_data.get('resources')
 
         if not resources_data:
-            if parse_capabilities_robust is None:
+            if self._load_parser() is None:
                 InfoBar.error(
                     title="Parameter Validation Error",
                     content="AAS parser (parse_capabilities_robust) not available in this build.",
                     orient=Qt.Orientation.Horizontal,
                     isClosable=True,
                     position=InfoBarPosition.TOP_RIGHT,
-                    parent=self.window()
+                    parent=self._main
                 )
                 return
 
             resource_dir = QFileDialog.getExistingDirectory(
                 self,
                 "Select Resource Directory (AAS XML/AASX)",
-                start_dir
+                start_dir,
+                self._dialog_options(directory=True)
             )
             if not resource_dir:
                 return
 
             self._append_log(f"[PARAM-VALIDATION] Parsing resources from: {resource_dir}")
-            resources_data = {}
+            self._set_param_validation_busy(True)
+
+            # Parse on a worker thread; validation continues in the finished slot.
+            # The worker hands back the last result if the folder is unchanged,
+            # which also keeps the UUID index cached for it
+            previous = None
+            if self._dir_resources is not None and self._dir_resources[0] == resource_dir:
+                previous = self._dir_resources[1:]
+            self._resource_worker = ResourceParseWorker(
+                resource_dir, log_prefix="[PARAM-VALIDATION]", previous=previous
+            )
+            self._resource_worker.log_signal.connect(self._append_log)
+            self._resource_worker.error_signal.connect(self._on_resource_parse_error)
+            self._resource_worker.finished_signal.connect(
+                lambda parsed, signature: self._on_resources_parsed(xml_path, resource_dir, parsed, signature)
+            )
+            self._resource_worker.start()
+            return
+
+        self._run_parameter_validation(xml_path, resources_data)
+
+    def _load_parser(self):
+        # For on-demand parsing if no cached resources exist
+        if self._parser is None:
             try:
-                for fn in os.listdir(resource_dir):
-                    if not (fn.lower().endswith('.xml') or fn.lower().endswith('.aasx')):
-                        continue
-                    full = os.path.join(resource_dir, fn)
-                    res_name = os.path.splitext(fn)[0]
-                    try:
-                        caps = parse_capabilities_robust(full)
-                        if caps:
-                            resources_data[f"resource: {res_name}"] = caps
-                    except Exception as pe:
-                        self._append_log(f"[PARAM-VALIDATION] Warning: failed to parse {fn}: {pe}")
-            except Exception as e:
-                InfoBar.error(
-                    title="Resource Parsing Failed",
-                    content=str(e),
-                    orient=Qt.Orientation.Horizontal,
-                    isClosable=True,
-                    position=InfoBarPosition.TOP_RIGHT,
-                    parent=self.window()
-                )
-                return
+                from Code.SMT4ModPlant.AASxmlCapabilityParser import parse_capabilities_robust
+                self._parser = parse_capabilities_robust
+            except Exception:
+                return None
+        return self._parser
+
+    def _set_param_validation_busy(self, busy: bool):
+        self.btn_param_validate.setEnabled(not busy)
+        self.btn_param_validate.setText("Validating..." if busy else "Parameter Validierung")
+
+    def _on_resource_parse_error(self, msg: str):
+        self._set_param_validation_busy(False)
+        InfoBar.error(
+            title="Resource Parsing Failed",
+            content=msg,
+            orient=Qt.Orientation.Horizontal,
+            isClosable=True,
+            position=InfoBarPosition.TOP_RIGHT,
+            parent=self._main
+        )
 
-        try:
-            ok, errors, warnings, checked, details = validate_master_recipe_parameters(xml_path, resources_data)
+    def _on_resources_parsed(self, xml_path: str, resource_dir: str, resources_data: Dict, signature):
+        self._dir_resources = (resource_dir, signature, resources_data)
+        self._run_parameter_validation(xml_path, resources_data)
+
+    def _run_parameter_validation(self, xml_path: str, resources_data: Dict):
+        # Validation reads the whole recipe; keep it off the GUI thread
+        self._set_param_validation_busy(True)
+
+        # The UUID index only depends on resources_data; reuse it while the
+        # same resources object is validated again
+        index = None
+        if self._param_index is not None and self._param_index[0] is resources_data:
+            index = self._param_index[1]
 
-            self._append_log(f"[PARAM-VALIDATION] XML: {xml_path}")
-            self._append_log(f"[PARAM-VALIDATION] Checked parameters: {checked}")
+        self._param_worker = ParameterValidationWorker(xml_path, resources_data, precomputed_index=index)
+        self._param_worker.index_signal.connect(
+            lambda built: self._store_param_index(resources_data, built)
+        )
+        self._param_worker.finished_signal.connect(
+            lambda *result: self._on_parameter_validation_finished(xml_path, *result)
+        )
+        self._param_worker.error_signal.connect(self._on_parameter_validation_error)
+        self._param_worker.start()
 
+    def _store_param_index(self, resources_data: Dict, index):
+        # Keeps a reference to resources_data so the identity check stays valid
+        self._param_index = (resources_data, index)
+
+    def _on_parameter_validation_finished(self, xml_path: str, ok: bool, errors: List[str],
+                                          warnings: List[str], checked: int, details: List[Dict]):
+        self._set_param_validation_busy(False)
+        try:
             found_items = [d for d in details if d.get('status') == 'FOUND']
             missing_items = [d for d in details if d.get('status') == 'MISSING']
-            self._append_log(f"[PARAM-VALIDATION] Matched: {len(found_items)} | Missing: {len(missing_items)}")
 
+            # Build the report locally and flush it to the log page in one append
+            lines = [
+                f"[PARAM-VALIDATION] XML: {xml_path}",
+                f"[PARAM-VALIDATION] Checked parameters: {checked}",
+                f"[PARAM-VALIDATION] Matched: {len(found_items)} | Missing: {len(missing_items)}",
+            ]
             for d in found_items[:50]:
-                self._append_log(
+                lines.append(
                     f"  OK: {d.get('description')} -> uuid={d.get('uuid')} "
                     f"in {d.get('resource_key')} / {d.get('capability_name')} / {d.get('property_name')} "
                     f"({d.get('property_unit')})"
                 )
-
-
-            for w in warnings[:100]:
-                self._append_log(f"  WARN: {w}")
-            for e in errors[:200]:
-                self._append_log(f"  ERROR: {e}")
+            lines.extend(f"  WARN: {w}" for w in warnings[:100])
+            lines.extend(f"  ERROR: {e}" for e in errors[:200])
+            self._append_logs(lines)
 
             if ok:
                 InfoBar.success(
@@ -375,7 +704,7 @@ class ResultsPage(QWidget):
                     isClosable=True,
                     position=InfoBarPosition.TOP_RIGHT,
                     duration=6000,
-                    parent=self.window()
+                    parent=self._main
                 )
             else:
                 preview = " | ".join(errors[:2])
@@ -387,130 +716,106 @@ class ResultsPage(QWidget):
                     isClosable=True,
                     position=InfoBarPosition.TOP_RIGHT,
                     duration=9000,
-                    parent=self.window()
+                    parent=self._main
                 )
 
-        except Exception as e:
+        except Exception:
             import traceback
-            traceback.print_exc()
-            self._append_log("[PARAM-VALIDATION] Exception occurred:")
-            self._append_log(traceback.format_exc())
-            InfoBar.error(
-                title="Parameter Validation Error",
-                content=str(e),
-                orient=Qt.Orientation.Horizontal,
-                isClosable=True,
-                position=InfoBarPosition.TOP_RIGHT,
-                parent=self.window()
-            )
+            self._on_parameter_validation_error(traceback.format_exc())
+
+    def _on_parameter_validation_error(self, tb: str):
+        self._set_param_validation_busy(False)
+        self._append_logs(["[PARAM-VALIDATION] Exception occurred:", tb])
+        InfoBar.error(
+            title="Parameter Validation Error",
+            content=tb.strip().splitlines()[-1] if tb.strip() else "Unknown error",
+            orient=Qt.Orientation.Horizontal,
+            isClosable=True,
+            position=InfoBarPosition.TOP_RIGHT,
+            parent=self._main
+        )
 
     # =========================
     # TABLE UPDATE (FIXED FOR ULTRA)
     # =========================
-    def update_table(self, data: List[Dict]):
+    def update_table(self, data: List[Dict], has_score: Optional[bool] = None):
         """
         Update result table.
         Ultra/Pro consistent: insert a separator row whenever solution_id changes.
+        has_score comes from the producer; it is only detected from the rows
+        when the caller does not know it.
         """
 
-        # -------- detect score mode --------
-        has_score = False
-        if data:
-            for row in data:
-                if row:
-                    has_score = ('composite_score' in row)
-                    break
-
         # -------- rebuild data with separators by solution_id change (DO NOT rely on input {}) --------
-        display_data: List[Dict] = []
-        prev_sid = None
-        for row in data:
-            if not row:
-                continue
-            sid = row.get("solution_id", None)
-            if prev_sid is not None and sid is not None and sid != prev_sid:
-                display_data.append({})  # separator marker
-            display_data.append(row)
-            prev_sid = sid
-        data = display_data
-
-        # -------- headers/columns --------
-        if has_score:
-            headers = ["Sol ID", "Score", "Step", "Description", "Resource", "Capabilities", "Energy", "Use", "CO2"]
-            self.table.setColumnCount(9)
-        else:
-            headers = ["Sol ID", "Step", "Description", "Resource", "Capabilities", "Status"]
-            self.table.setColumnCount(6)
-
-        # -------- clear old state --------
-        self.table.setSortingEnabled(False)
-        self.table.clearContents()
-        try:
-            self.table.clearSpans()
-        except Exception:
-            pass
+        display_data, separator_rows = _insert_separators(data)
 
-        self.table.setHorizontalHeaderLabels(headers)
+        # -------- detect score mode --------
+        # The separator pass already dropped empty rows, so the first display
+        # row is the first real row; no separate scan over data is needed
+        if has_score is None:
+            has_score = bool(display_data) and 'composite_score' in display_data[0]
+
+        # -------- format cells (large result sets off the GUI thread) --------
+        # A running worker is now stale; its result is ignored in _on_cells_formatted
+        self._retire_format_worker()
+        if len(display_data) < ASYNC_FORMAT_MIN_ROWS:
+            self._fill_table(display_data, separator_rows, has_score)
+            return
 
-        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        # Drop the previous run's rows now: context_data already belongs to the
+        # new run, so an old row must not stay selectable for export meanwhile
+        self.model.set_rows([], set(), has_score, [])
+        worker = TableFormatWorker(display_data, ResultsTableModel.spec_for(has_score))
+        worker.finished_signal.connect(
+            lambda cells: self._on_cells_formatted(worker, display_data, separator_rows, has_score, cells)
+        )
+        worker.error_signal.connect(
+            lambda tb: self._on_cells_formatted(worker, display_data, separator_rows, has_score, None)
+        )
+        self._format_worker = worker
+        worker.start()
+
+    def _retire_format_worker(self):
+        # Never wait() on the GUI thread: keep superseded workers referenced so
+        # no QThread is destroyed while running, and drop those that have ended
+        self._retired_format_workers = [w for w in self._retired_format_workers if w.isRunning()]
+        if self._format_worker is not None:
+            self._retired_format_workers.append(self._format_worker)
+            self._format_worker = None
+
+    def _on_cells_formatted(self, worker, display_data: List[Dict], separator_rows: Set[int],
+                            has_score: bool, cells):
+        if worker is not self._format_worker:
+            return
+        self._format_worker = None
+        # On a worker error cells is None and set_rows formats inline
+        self._fill_table(display_data, separator_rows, has_score, cells)
+
+    def _fill_table(self, display_data: List[Dict], separator_rows: Set[int], has_score: bool,
+                    cells=None):
+        # -------- swap model rows (single reset, no per-cell items) --------
+        header = self.table.horizontalHeader()
         cap_col_idx = 5 if has_score else 4
-        self.table.horizontalHeader().setSectionResizeMode(cap_col_idx, QHeaderView.ResizeMode.Stretch)
-
-        # Make row height controllable
-        try:
-            self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
-        except Exception:
-            pass
-
-        self.table.setRowCount(len(data))
 
-        # -------- separator style --------
-
-        separator_height = 24
-        sep_bg = QColor("#f3f3f3")
+        # No intermediate repaints / view signals while the table is rebuilt
+        self.table.setUpdatesEnabled(False)
+        blocker = QSignalBlocker(self.table)
+        self.table.setSortingEnabled(False)
         try:
-            from qfluentwidgets import isDarkTheme
-            if isDarkTheme():
-                sep_bg = QColor("#2a2a2a")
-        except Exception:
-            pass
-
-        # -------- fill table --------
-        for r, row_data in enumerate(data):
-            # separator row: fill every column with empty item (no spans!)
-            if not row_data:
-                self.table.setRowHeight(r, separator_height)
-                for c in range(self.table.columnCount()):
-                    it = QTableWidgetItem("")
-                    it.setFlags(Qt.ItemFlag.NoItemFlags)
-                    it.setBackground(sep_bg)
-                    self.table.setItem(r, c, it)
-                continue
-
-            # normal rows
-            if has_score:
-                self.table.setItem(r, 0, QTableWidgetItem(str(row_data.get('solution_id', ''))))
-                self.table.setItem(r, 1, QTableWidgetItem(f"{row_data.get('composite_score', 0):.2f}"))
-                self.table.setItem(r, 2, QTableWidgetItem(str(row_data.get('step_id', ''))))
-                self.table.setItem(r, 3, QTableWidgetItem(str(row_data.get('description', ''))))
-                self.table.setItem(r, 4, QTableWidgetItem(str(row_data.get('resource', ''))))
-                self.table.setItem(r, 5, QTableWidgetItem(str(row_data.get('capabilities', ''))))
-                self.table.setItem(r, 6, QTableWidgetItem(f"{row_data.get('energy_cost', 0):.1f}"))
-                self.table.setItem(r, 7, QTableWidgetItem(f"{row_data.get('use_cost', 0):.1f}"))
-                self.table.setItem(r, 8, QTableWidgetItem(f"{row_data.get('co2_footprint', 0):.1f}"))
-            else:
-                self.table.setItem(r, 0, QTableWidgetItem(str(row_data.get('solution_id', ''))))
-                self.table.setItem(r, 1, QTableWidgetItem(str(row_data.get('step_id', ''))))
-                self.table.setItem(r, 2, QTableWidgetItem(str(row_data.get('description', ''))))
-                self.table.setItem(r, 3, QTableWidgetItem(str(row_data.get('resource', ''))))
-                self.table.setItem(r, 4, QTableWidgetItem(str(row_data.get('capabilities', ''))))
-                status_item = QTableWidgetItem(str(row_data.get('status', '')))
-                status_item.setForeground(QColor("#28a745"))
-                self.table.setItem(r, 5, status_item)
-
-        self.table.resizeRowsToContents()
-        for r, row_data in enumerate(data):
-            if not row_data:
-                self.table.setRowHeight(r, separator_height)
-
-        self.table.setSortingEnabled(True)
+            header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+            self.model.set_rows(display_data, separator_rows, has_score, cells)
+
+            # Fixed starting widths instead of measuring cell text; columns stay
+            # user-resizable and Capabilities takes the remaining space
+            widths = SCORE_COLUMN_WIDTHS if has_score else PLAIN_COLUMN_WIDTHS
+            for col, width in enumerate(widths):
+                self.table.setColumnWidth(col, width)
+            header.setSectionResizeMode(cap_col_idx, QHeaderView.ResizeMode.Stretch)
+
+            # Keep producer order until the user clicks a header
+            header.setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        finally:
+            self.table.setSortingEnabled(True)
+            # Restores the previous blocked state rather than forcing it off
+            blocker.unblock()
+            self.table.setUpdatesEnabled(True)
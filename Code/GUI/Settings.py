@@ -1,5 +1,7 @@
 # Code/GUI/Settings.py
 import os
+from decimal import Decimal, ROUND_HALF_UP
+from PyQt6.QtCore import QSignalBlocker
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QFileDialog
 from qfluentwidgets import (
     CardWidget, IconWidget, BodyLabel, SwitchButton, CaptionLabel,
@@ -7,6 +9,21 @@ from qfluentwidgets import (
     FluentIcon, setTheme, Theme, LineEdit, PushButton
 )
 
+# Skip per-entry icon lookups and symlink resolution; these stall dialogs on
+# network or overlay filesystems. ReadOnly suits the input pickers only; see
+# get_dialog_options(writable=True) for pickers of output locations
+FILE_DIALOG_OPTIONS = (
+    QFileDialog.Option.DontUseCustomDirectoryIcons
+    | QFileDialog.Option.DontResolveSymlinks
+    | QFileDialog.Option.ReadOnly
+)
+
+
+def _spin_round(value: float, decimals: int) -> float:
+    """Round the way QDoubleSpinBox does: half up on the exact binary value."""
+    return float(Decimal(value).quantize(Decimal(1).scaleb(-decimals), rounding=ROUND_HALF_UP))
+
+
 class SettingsPage(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -133,6 +150,27 @@ class SettingsPage(QWidget):
         layout.addWidget(self.card_weights)
         
         self.card_weights.setVisible(False)
+
+        # =============================================
+        # 4. File Dialog Mode
+        # =============================================
+        self.card_dialog = CardWidget(self)
+        l_dialog = QHBoxLayout(self.card_dialog)
+        l_dialog.setContentsMargins(20, 20, 20, 20)
+
+        v_dialog = QVBoxLayout()
+        lbl_dialog = SubtitleLabel("Built-in File Dialog", self)
+        lbl_dialog_desc = CaptionLabel("Use Qt's own dialog instead of the system one (faster on network drives)", self)
+        v_dialog.addWidget(lbl_dialog)
+        v_dialog.addWidget(lbl_dialog_desc)
+
+        self.switch_qt_dialog = SwitchButton(self)
+        self.switch_qt_dialog.setChecked(False)
+
+        l_dialog.addLayout(v_dialog)
+        l_dialog.addStretch(1)
+        l_dialog.addWidget(self.switch_qt_dialog)
+        layout.addWidget(self.card_dialog)
         
         # Connect signals
         self.spin_energy.valueChanged.connect(lambda v: self.balance_weights(self.spin_energy, v))
@@ -155,10 +193,26 @@ class SettingsPage(QWidget):
 
     def browse_path(self):
         """Open a dialog to select a custom export directory."""
-        d = QFileDialog.getExistingDirectory(self, "Select Export Directory", self.line_path.text())
+        d = QFileDialog.getExistingDirectory(
+            self, "Select Export Directory", self.line_path.text(),
+            self.get_dialog_options(directory=True, writable=True)
+        )
         if d:
             self.line_path.setText(d)
 
+    def get_dialog_options(self, directory: bool = False, writable: bool = False):
+        """Return the QFileDialog options to use for every file/folder picker.
+        Pass writable=True for output locations, so the dialog still allows
+        creating folders."""
+        opts = FILE_DIALOG_OPTIONS
+        if writable:
+            opts &= ~QFileDialog.Option.ReadOnly
+        if directory:
+            opts |= QFileDialog.Option.ShowDirsOnly
+        if self.switch_qt_dialog.isChecked():
+            opts |= QFileDialog.Option.DontUseNativeDialog
+        return opts
+
     def get_export_path(self):
         """Return the current export path."""
         return self.line_path.text()
@@ -177,15 +231,23 @@ class SettingsPage(QWidget):
         
         others = [s for s in [self.spin_energy, self.spin_use, self.spin_co2] if s != source_spin]
         
-        for s in others: s.blockSignals(True)
-        
+        # Final values are clamped and rounded here (as the spin box would), so
+        # prev_vals is filled without reading each value back from Qt.
+        # prev_vals always mirrors the spin boxes, so it also serves as "current".
         adjustment = delta / 2.0
-        for s in others:
-            curr = s.value()
-            s.setValue(max(0.0, min(1.0, curr - adjustment)))
-            self.prev_vals[s] = s.value()
-            
-        for s in others: s.blockSignals(False)
+        new_vals = [
+            _spin_round(max(0.0, min(1.0, self.prev_vals[s] - adjustment)), s.decimals())
+            for s in others
+        ]
+        
+        # Blockers restore each spin box's signal state even if setValue raises
+        blockers = [QSignalBlocker(s) for s in others]
+        try:
+            for s, v in zip(others, new_vals):
+                self.prev_vals[s] = v
+                s.setValue(v)
+        finally:
+            for b in blockers: b.unblock()
 
     def toggle_theme(self, checked):
         """Switch between Light and Dark themes."""
@@ -12,14 +12,15 @@ from PyQt6.QtCore import QThread, pyqtSignal
 # =========================
 try:
     from Code.SMT4ModPlant.GeneralRecipeParser import parse_general_recipe
-    from Code.SMT4ModPlant.AASxmlCapabilityParser import parse_capabilities_robust
+    from Code.SMT4ModPlant.AASxmlCapabilityParser import parse_capabilities_many
     from Code.SMT4ModPlant.SMT4ModPlant_main import run_optimization
     from Code.Optimizer.Optimization import SolutionOptimizer
 
     # validation logic in backend
     from Code.Transformator.MasterRecipeValidator import (
         validate_master_recipe_xml,
-        validate_master_recipe_parameters
+        validate_master_recipe_parameters,
+        build_uuid_index_from_capabilities
     )
 
 except ImportError as e:
@@ -34,7 +35,7 @@ except ImportError as e:
 class SMTWorker(QThread):
     log_signal = pyqtSignal(str)
     progress_signal = pyqtSignal(int, int)
-    finished_signal = pyqtSignal(list, dict)
+    finished_signal = pyqtSignal(list, dict, bool)  # rows, context, rows carry scores
     error_signal = pyqtSignal(str)
 
     def __init__(self, recipe_path, resource_dir, mode_index, weights):
@@ -57,10 +58,12 @@ class SMTWorker(QThread):
             # 2. Parse Resource Capabilities (AAS / XML / AASX)
             # ==================================================
             self.log_signal.emit(f"Scanning resource directory: {self.resource_dir}")
-            resource_files = [
-                f for f in os.listdir(self.resource_dir)
-                if f.lower().endswith(('.xml', '.aasx'))
-            ]
+            with os.scandir(self.resource_dir) as it:
+                # Name filter first, then is_file() from the cached entry type
+                resource_files = [
+                    e for e in it
+                    if e.name.lower().endswith(('.xml', '.aasx')) and e.is_file()
+                ]
 
             if not resource_files:
                 raise FileNotFoundError(
@@ -68,26 +71,36 @@ class SMTWorker(QThread):
                 )
 
             all_capabilities = {}
-            total_files = len(resource_files)
 
-            for idx, filename in enumerate(resource_files):
-                full_path = os.path.join(self.resource_dir, filename)
-                res_name = Path(filename).stem
+            for entry in resource_files:
+                self.log_signal.emit(f"Parsing resource file: {entry.name}")
 
-                self.log_signal.emit(f"Parsing resource file: {filename}")
+            # Only emit when the integer percentage moves; this caps the
+            # queued cross-thread signals at ~20 however many files there are
+            last_pct = -1
 
-                try:
-                    caps = parse_capabilities_robust(full_path)
-                    if caps:
-                        key_name = f"resource: {res_name}"
-                        all_capabilities[key_name] = caps
-                except Exception as parse_err:
+            def on_parsed(done, total):
+                nonlocal last_pct
+                pct = 10 + int(done / total * 20)
+                if pct != last_pct:
+                    self.progress_signal.emit(pct, 100)
+                    last_pct = pct
+
+            # Files are independent; parse them in parallel, progress per finished file
+            results = parse_resource_files(
+                [e.path for e in resource_files],
+                progress_callback=on_parsed
+            )
+
+            # Results are in listing order, so resource key order is unchanged
+            for entry, (caps, parse_err) in zip(resource_files, results):
+                if parse_err is not None:
                     self.log_signal.emit(
-                        f"Warning: Failed to parse {filename}: {parse_err}"
+                        f"Warning: Failed to parse {entry.name}: {parse_err}"
                     )
-
-                progress = 10 + int((idx + 1) / total_files * 20)
-                self.progress_signal.emit(progress, 100)
+                elif caps:
+                    key_name = f"resource: {Path(entry.name).stem}"
+                    all_capabilities[key_name] = caps
 
             if not all_capabilities:
                 raise ValueError("No valid resources loaded.")
@@ -96,6 +109,10 @@ class SMTWorker(QThread):
                 f"Loaded {len(all_capabilities)} valid resources."
             )
 
+            # Built here once so parameter validation on the Results page
+            # can reuse it instead of walking every capability again
+            resources_index = build_uuid_index_from_capabilities(all_capabilities)
+
             # ==================================================
             # 3. SMT Optimization
             # ==================================================
@@ -120,6 +137,7 @@ class SMTWorker(QThread):
             # ==================================================
             # 4. Ultra Mode – Cost Optimization
             # ==================================================
+            has_score = False
             if is_ultra and json_solutions:
                 self.log_signal.emit(
                     "Ultra Mode: Calculating costs and finding optimal solution..."
@@ -135,14 +153,15 @@ class SMTWorker(QThread):
 
                 sorted_gui_results = []
 
+                # Group rows once instead of rescanning gui_results per solution
+                rows_by_solution = {}
+                for r in gui_results:
+                    rows_by_solution.setdefault(r.get("solution_id"), []).append(r)
+
                 for eval_sol in evaluated_solutions:
                     sol_id = eval_sol["solution_id"]
-                    rows = [
-                        r for r in gui_results
-                        if r.get("solution_id") == sol_id
-                    ]
 
-                    for row in rows:
+                    for row in rows_by_solution.get(sol_id, ()):
                         row["composite_score"] = eval_sol["composite_score"]
                         row["energy_cost"] = eval_sol["total_energy_cost"]
                         row["use_cost"] = eval_sol["total_use_cost"]
@@ -150,6 +169,7 @@ class SMTWorker(QThread):
                         sorted_gui_results.append(row)
 
                 gui_results = sorted_gui_results
+                has_score = True
 
                 if evaluated_solutions:
                     self.log_signal.emit(
@@ -166,10 +186,172 @@ class SMTWorker(QThread):
                 "resources": all_capabilities,
                 "solutions": json_solutions,
                 "recipe": recipe_data,
+                "resources_index": resources_index,
             }
 
-            self.finished_signal.emit(gui_results, context_data)
+            self.finished_signal.emit(gui_results, context_data, has_score)
+
+        except Exception as e:
+            self.error_signal.emit(str(e))
+            self.log_signal.emit(traceback.format_exc())
+
+
+# ==========================================================
+# Resource Parse Worker (on-demand AAS parsing for validation)
+# ==========================================================
+
+def parse_resource_files(paths, progress_callback=None):
+    """
+    Parse AAS files in parallel; returns [(capabilities, error_message), ...]
+    in the order of paths. progress_callback(done, total) is called as
+    files finish, in completion order. See parse_capabilities_many.
+    """
+    results = parse_capabilities_many(paths, progress_callback=progress_callback)
+    return [results[p] for p in paths]
+
+
+class ResourceParseWorker(QThread):
+    log_signal = pyqtSignal(str)
+    # resources_data, directory signature it was parsed from
+    finished_signal = pyqtSignal(dict, object)
+    error_signal = pyqtSignal(str)
+
+    def __init__(self, resource_dir, log_prefix="", previous=None):
+        super().__init__()
+        self.resource_dir = resource_dir
+        self.log_prefix = log_prefix
+        # (signature, resources_data) from an earlier run on the same directory
+        self.previous = previous
+
+    def run(self):
+        try:
+            with os.scandir(self.resource_dir) as it:
+                # Name filter first: it is free, while is_file() may need a
+                # stat for entries whose type the directory listing left open
+                files = [
+                    e for e in it
+                    if e.name.lower().endswith(('.xml', '.aasx')) and e.is_file()
+                ]
+
+            # Unchanged files -> the earlier result (same dict object) is reused
+            signature = []
+            for e in files:
+                st = e.stat()
+                signature.append((e.name, st.st_mtime_ns, st.st_size))
+            signature = tuple(signature)
+            if self.previous is not None and self.previous[0] == signature:
+                self.log_signal.emit(f"{self.log_prefix} Resource files unchanged; reusing parsed resources")
+                self.finished_signal.emit(self.previous[1], signature)
+                return
+
+            resources_data = {}
+            if not files:
+                self.finished_signal.emit(resources_data, signature)
+                return
+
+            results = parse_resource_files([e.path for e in files])
+
+            # Results come back in directory order so resource key order stays stable
+            for entry, (caps, err) in zip(files, results):
+                if err is not None:
+                    self.log_signal.emit(
+                        f"{self.log_prefix} Warning: failed to parse {entry.name}: {err}"
+                    )
+                elif caps:
+                    resources_data[f"resource: {entry.name.rsplit('.', 1)[0]}"] = caps
+
+            self.finished_signal.emit(resources_data, signature)
 
         except Exception as e:
             self.error_signal.emit(str(e))
             self.log_signal.emit(traceback.format_exc())
+
+
+# ==========================================================
+# XSD Validation Worker (MasterRecipe vs. allschema set)
+# ==========================================================
+
+class ValidationWorker(QThread):
+    # ok, errors, used_root (None when no XSD was found)
+    finished_signal = pyqtSignal(bool, list, object)
+    error_signal = pyqtSignal(str)
+
+    def __init__(self, xml_path, schema_dir, root_xsd_path=None):
+        super().__init__()
+        self.xml_path = xml_path
+        self.schema_dir = schema_dir
+        self.root_xsd_path = root_xsd_path
+
+    def run(self):
+        try:
+            ok, errors, used_root = validate_master_recipe_xml(
+                self.xml_path, self.schema_dir, root_xsd_path=self.root_xsd_path
+            )
+            self.finished_signal.emit(ok, errors, used_root)
+        except Exception:
+            self.error_signal.emit(traceback.format_exc())
+
+
+# ==========================================================
+# Parameter Validation Worker (MasterRecipe vs. AAS capabilities)
+# ==========================================================
+
+class ParameterValidationWorker(QThread):
+    # (uuid_index, warnings) built for resources_data, so the caller can reuse it
+    index_signal = pyqtSignal(object)
+    # ok, errors, warnings, checked, details
+    finished_signal = pyqtSignal(bool, list, list, int, list)
+    error_signal = pyqtSignal(str)
+
+    def __init__(self, xml_path, resources_data, precomputed_index=None):
+        super().__init__()
+        self.xml_path = xml_path
+        self.resources_data = resources_data
+        self.precomputed_index = precomputed_index
+
+    def run(self):
+        try:
+            index = self.precomputed_index
+            if index is None:
+                index = build_uuid_index_from_capabilities(self.resources_data)
+                self.index_signal.emit(index)
+
+            ok, errors, warnings, checked, details = validate_master_recipe_parameters(
+                self.xml_path, self.resources_data, precomputed_index=index
+            )
+            self.finished_signal.emit(ok, errors, warnings, checked, details)
+        except Exception:
+            self.error_signal.emit(traceback.format_exc())
+
+
+# ==========================================================
+# Table Format Worker (result cell strings off the GUI thread)
+# ==========================================================
+
+def format_table_cells(rows, spec):
+    """
+    Format rows into tuples of display strings, one per column.
+    spec holds (key, formatter, default) per column; empty rows
+    (separators) map to None.
+    """
+    return [
+        tuple([fmt(r.get(key, default)) for key, fmt, default in spec]) if r else None
+        for r in rows
+    ]
+
+
+class TableFormatWorker(QThread):
+    # cells in row order (see format_table_cells)
+    finished_signal = pyqtSignal(list)
+    error_signal = pyqtSignal(str)
+
+    def __init__(self, rows, spec):
+        super().__init__()
+        self.rows = rows
+        self.spec = spec
+
+    def run(self):
+        try:
+            self.finished_signal.emit(format_table_cells(self.rows, self.spec))
+        except Exception:
+            self.error_signal.emit(traceback.format_exc())
@@ -1,7 +1,9 @@
 # Code/Optimizer/Optimization.py
 import json
 import os
-import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from lxml import etree as ET
+from operator import itemgetter
 from typing import Dict, List, Any
 
 class SolutionOptimizer:
@@ -13,6 +15,9 @@ class SolutionOptimizer:
             "CO2Footprint": 0.3
         }
         self.resource_costs = {}
+        # "resource: NAME" -> (NAME, energy, use, co2), or () if NAME has no
+        # costs; filled lazily from resource_costs
+        self._cost_rows = {}
 
     def set_weights(self, energy_weight, use_weight, co2_weight):
         """Set custom weights and normalize them"""
@@ -28,30 +33,34 @@ class SolutionOptimizer:
     def extract_resource_cost_data(self, xml_file_path: str) -> Dict[str, float]:
         """Extract resource cost data from AAS XML file"""
         try:
-            tree = ET.parse(xml_file_path)
-            root = tree.getroot()
-            
             cost_data = {
                 "EnergyCost": 0.0,
                 "UseCost": 0.0,
                 "CO2Footprint": 0.0
             }
             
-            # Find OptimizationCost submodel (namespace agnostic search)
-            for submodel in root.findall('.//{*}submodel'):
+            # Stream submodels (namespace agnostic) instead of building the
+            # whole document; other submodels are dropped as soon as they close
+            # and parsing stops after the OptimizationCost submodel.
+            # huge_tree keeps large embedded AAS content parseable.
+            for _, submodel in ET.iterparse(xml_file_path, events=("end",), tag="{*}submodel", huge_tree=True):
                 id_short = submodel.find('{*}idShort')
-                if id_short is not None and id_short.text == 'OptimizationCost':
-                    for prop in submodel.findall('.//{*}property'):
-                        prop_id = prop.find('{*}idShort')
-                        value_elem = prop.find('{*}value')
-                        
-                        if prop_id is not None and value_elem is not None:
-                            prop_name = prop_id.text
-                            if prop_name in cost_data:
-                                try:
-                                    cost_data[prop_name] = float(value_elem.text)
-                                except (ValueError, TypeError):
-                                    cost_data[prop_name] = 0.0
+                if id_short is None or id_short.text != 'OptimizationCost':
+                    submodel.clear(keep_tail=True)
+                    continue
+
+                for prop in submodel.iterfind('.//{*}property'):
+                    prop_id = prop.find('{*}idShort')
+                    value_elem = prop.find('{*}value')
+                    
+                    if prop_id is not None and value_elem is not None:
+                        prop_name = prop_id.text
+                        if prop_name in cost_data:
+                            try:
+                                cost_data[prop_name] = float(value_elem.text)
+                            except (ValueError, TypeError):
+                                cost_data[prop_name] = 0.0
+                break
             return cost_data
             
         except Exception as e:
@@ -64,15 +73,36 @@ class SolutionOptimizer:
             print(f"Directory not found: {resource_dir}")
             return
 
-        for filename in os.listdir(resource_dir):
-            if filename.lower().endswith('.xml'):
-                file_path = os.path.join(resource_dir, filename)
-                # Resource name is filename without extension (e.g. "2025-04_HC10")
-                resource_name = os.path.splitext(filename)[0]
-                
-                cost_data = self.extract_resource_cost_data(file_path)
-                if cost_data:
-                    self.resource_costs[resource_name] = cost_data
+        filenames = [f for f in os.listdir(resource_dir) if f.lower().endswith('.xml')]
+        file_paths = [os.path.join(resource_dir, f) for f in filenames]
+
+        # Files are independent and lxml parses without holding the GIL;
+        # map() keeps listing order, so resource_costs order is unchanged
+        if len(file_paths) > 1:
+            with ThreadPoolExecutor(max_workers=min(32, len(file_paths))) as ex:
+                results = list(ex.map(self.extract_resource_cost_data, file_paths))
+        else:
+            results = [self.extract_resource_cost_data(p) for p in file_paths]
+
+        for filename, cost_data in zip(filenames, results):
+            # Resource name is filename without extension (e.g. "2025-04_HC10")
+            resource_name = os.path.splitext(filename)[0]
+            if cost_data:
+                self.resource_costs[resource_name] = cost_data
+
+        self._cost_rows.clear()
+
+    def _cost_row(self, resource_str: str) -> tuple:
+        """(name, energy, use, co2) for an assignment's resource string, or ()"""
+        # Handle "resource: NAME" format
+        resource_name = resource_str.split(': ')[1] if ': ' in resource_str else resource_str
+        cost_data = self.resource_costs.get(resource_name)
+        if cost_data is None:
+            row = ()
+        else:
+            row = (resource_name, cost_data['EnergyCost'], cost_data['UseCost'], cost_data['CO2Footprint'])
+        self._cost_rows[resource_str] = row
+        return row
 
     def calculate_solution_cost(self, solution: Dict[str, Any]) -> Dict[str, Any]:
         """Calculate total cost for a single solution"""
@@ -80,24 +110,33 @@ class SolutionOptimizer:
         total_use_cost = 0.0
         total_co2_footprint = 0.0
         resource_usage = {}
+
+        # One table lookup per assignment instead of parsing the name and
+        # reading three costs from the nested dict every time
+        cost_rows = self._cost_rows
         
         for assignment in solution['assignments']:
-            # Handle "resource: NAME" format
             resource_str = assignment['resource']
-            resource_name = resource_str.split(': ')[1] if ': ' in resource_str else resource_str
+            row = cost_rows.get(resource_str)
+            if row is None:
+                row = self._cost_row(resource_str)
             
-            if resource_name in self.resource_costs:
-                cost_data = self.resource_costs[resource_name]
-                total_energy_cost += cost_data['EnergyCost']
-                total_use_cost += cost_data['UseCost']
-                total_co2_footprint += cost_data['CO2Footprint']
+            if row:
+                resource_name, energy_cost, use_cost, co2_footprint = row
+                total_energy_cost += energy_cost
+                total_use_cost += use_cost
+                total_co2_footprint += co2_footprint
                 
                 resource_usage[resource_name] = resource_usage.get(resource_name, 0) + 1
+
+        weight_energy = self.weights["EnergyCost"]
+        weight_use = self.weights["UseCost"]
+        weight_co2 = self.weights["CO2Footprint"]
         
         composite_score = (
-            total_energy_cost * self.weights["EnergyCost"] +
-            total_use_cost * self.weights["UseCost"] +
-            total_co2_footprint * self.weights["CO2Footprint"]
+            total_energy_cost * weight_energy +
+            total_use_cost * weight_use +
+            total_co2_footprint * weight_co2
         )
         
         return {
@@ -108,9 +147,9 @@ class SolutionOptimizer:
             "composite_score": composite_score,
             "resource_usage": resource_usage,
             "weighted_breakdown": {
-                "energy": total_energy_cost * self.weights["EnergyCost"],
-                "use": total_use_cost * self.weights["UseCost"],
-                "co2": total_co2_footprint * self.weights["CO2Footprint"]
+                "energy": total_energy_cost * weight_energy,
+                "use": total_use_cost * weight_use,
+                "co2": total_co2_footprint * weight_co2
             }
         }
 
@@ -119,13 +158,10 @@ class SolutionOptimizer:
         Optimize solutions passed directly from memory (no file I/O).
         Returns a list of dicts with cost details, sorted by composite score (ascending).
         """
-        evaluated_solutions = []
-        
-        for solution in solutions_data:
-            cost_result = self.calculate_solution_cost(solution)
-            evaluated_solutions.append(cost_result)
+        calculate = self.calculate_solution_cost
+        evaluated_solutions = [calculate(solution) for solution in solutions_data]
         
         # Sort by composite score (Lower is better/optimal)
-        evaluated_solutions.sort(key=lambda x: x["composite_score"])
+        evaluated_solutions.sort(key=itemgetter("composite_score"))
         
         return evaluated_solutions
\ No newline at end of file
@@ -1,234 +1,618 @@
-import xml.etree.ElementTree as ET
+from lxml import etree as ET
 import json
+import multiprocessing
 import zipfile
 import os
+import posixpath
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import ExitStack
+from copy import deepcopy
+from functools import lru_cache
 from pathlib import Path
 
+# =========================================================
+# Compiled XPath expressions
+# =========================================================
+# Every path used by the parser is compiled once at import time, so the
+# per-element lookups run entirely inside libxml2 instead of re-parsing the
+# path string on every find()/findall() call. The 'aas' prefix is resolved
+# when compiling, so matching costs no per-lookup namespace handling; renaming
+# every element to its local name first would only add a Python-level walk
+# over the whole document.
+#
+# Expressions that are only read through _first() end in a [1] step
+# ('descendant::aas:value[1]' rather than './/aas:value'), so libxml2 stops at
+# the first match in document order instead of collecting the whole subtree.
+NS = {'aas': 'https://admin-shell.io/aas/3/0'}
+_SUBMODEL_TAG = '{https://admin-shell.io/aas/3/0}submodel'
+_COLLECTION_TAG = '{https://admin-shell.io/aas/3/0}submodelElementCollection'
+_OPC_RELATIONSHIP_TAG = '{http://schemas.openxmlformats.org/package/2006/relationships}Relationship'
+
+def _xp(path):
+    return ET.XPath(path, namespaces=NS)
+
+_XP_SUBMODELS = _xp(".//aas:submodel")
+_XP_ANY_VALUE = _xp("descendant::aas:value[1]")
+_XP_CAP_SETS = _xp("aas:submodelElements/aas:submodelElementCollection")
+_XP_CHILD_COLLECTIONS = _xp("aas:value/aas:submodelElementCollection")
+_XP_ALL_COLLECTIONS = _xp(".//aas:submodelElementCollection")
+_XP_CAPABILITIES = _xp("aas:value/aas:capability")
+_XP_ID_SHORT = _xp("aas:idShort[1]")
+_XP_SUPPLEMENTAL_ID = _xp("aas:supplementalSemanticIds/descendant::aas:value[1]")
+_XP_SEMANTIC_ID = _xp("aas:semanticId/descendant::aas:value[1]")
+_XP_UNIT = _xp("aas:embeddedDataSpecifications/descendant::aas:value[1]")
+_XP_QUALIFIER = _xp("aas:qualifiers/descendant::aas:value[1]")
+_XP_COMMENT = _xp("aas:value/aas:multiLanguageProperty/aas:value/descendant::aas:text[1]")
+_XP_PROP_REALIZED_BY = _xp("aas:value/aas:relationshipElement/aas:second/descendant::aas:value[1]")
+_XP_RANGE = _xp("aas:value/aas:range[1]")
+_XP_LIST = _xp("aas:value/aas:submodelElementList[1]")
+_XP_VALUE_TYPE = _xp("aas:valueType[1]")
+_XP_VALUE_TYPE_LIST = _xp("aas:valueTypeListElement[1]")
+_XP_MIN = _xp("aas:min[1]")
+_XP_MAX = _xp("aas:max[1]")
+_XP_VALUE = _xp("aas:value[1]")
+_XP_CHILD_PROPERTIES = _xp("aas:value/aas:property")
+_XP_CHILD_RELATIONSHIPS = _xp("aas:value/aas:relationshipElement")
+_XP_CONSTRAINT_RELATIONSHIPS = _xp("aas:value/aas:submodelElementCollection/aas:value/aas:relationshipElement")
+_XP_SECOND_KEYS = _xp("aas:second/aas:keys[1]")
+_XP_SECOND_VALUE = _xp("aas:second/descendant::aas:value[1]")
+_XP_KEY = _xp("aas:key")
+
+# =========================================================
+# CapabilityDescription semantic IDs
+# =========================================================
+# Matched as substrings of the semanticId text ("x in text"), so the short
+# forms also accept ids published under another prefix.
+_SEM_CAPABILITY_SUBMODEL = "https://admin-shell.io/idta/CapabilityDescription/1/0/Submodel"
+_SEM_PROPERTY_SET = "https://admin-shell.io/idta/CapabilityDescription/PropertySet/1/0"
+_SEM_CAPABILITY_RELATIONS = "https://admin-shell.io/idta/CapabilityDescription/CapabilityRelations/1/0"
+_SEM_CONSTRAINT_SET = "https://admin-shell.io/idta/CapabilityDescription/ConstraintSet/1/0"
+_SEM_PROPERTY_CONSTRAINT_CONTAINER = "https://admin-shell.io/idta/CapabilityDescription/PropertyConstraintContainer/1/0"
+_SEM_CONSTRAINT_TYPE = "ConstraintType/1/0"
+_SEM_CONDITIONAL_TYPE = "PropertyConditionalType/1/0"
+_SEM_BASIC_CONSTRAINT = "BasicConstraint/1/0"
+_SEM_GENERALIZED_BY_SET = "GeneralizedBySet/1/0"
+_SEM_CAPABILITY_REALIZED_BY = "CapabilityRealizedBy/1/0"
+
+# Submodel filter evaluated inside libxml2: the text of the submodel's first
+# (semanticId) value must contain the CapabilityDescription submodel id.
+_XP_IS_CAPABILITY_SUBMODEL = _xp(
+    f"contains(descendant::aas:value[1]/text()[1], '{_SEM_CAPABILITY_SUBMODEL}')")
+
+# BasicConstraint qualifier value -> comparison operator prefixed to the constraint value
+_QUAL_OP = {
+    "GREATER_THAN_0": ">",
+    "GREATER_EQUAL_1": ">=",
+    "EQUAL_2": "==",
+    "NOT_EQUAL_3": "!=",
+    "LESS_EQUAL_4": "<=",
+    "LESS_THAN_5": "<",
+}
+
+def _first(xpath, element):
+    """Return the first node matched by a compiled XPath, or None (like find())."""
+    result = xpath(element)
+    return result[0] if result else None
+
+# =========================================================
+# Constraint helpers
+# =========================================================
+def _index_constraint_containers(capability_relations_list):
+    """
+    Walks CapabilityRelations -> ConstraintSet -> PropertyConstraintContainer once and
+    buckets every container under the property name its relationship points to
+    (the value of the last key of the relationship's 'second' reference).
+    """
+    constraints_by_propname = {}
+    for capability_relations in capability_relations_list:
+        for constraint_sets in _XP_CHILD_COLLECTIONS(capability_relations):
+            constraint_set_semantic_id = _first(_XP_SEMANTIC_ID, constraint_sets)
+            if constraint_set_semantic_id is not None and _SEM_CONSTRAINT_SET in constraint_set_semantic_id.text:
+                for constraint_set in _XP_CHILD_COLLECTIONS(constraint_sets):
+                    constraint_set_semantic_id = _first(_XP_SEMANTIC_ID, constraint_set)
+                    if constraint_set_semantic_id is not None and _SEM_PROPERTY_CONSTRAINT_CONTAINER in constraint_set_semantic_id.text:
+                        for relationship_constraint in _XP_CONSTRAINT_RELATIONSHIPS(constraint_set):
+                            second_keys = _first(_XP_SECOND_KEYS, relationship_constraint)
+                            if second_keys is not None:
+                                key_elements = _XP_KEY(second_keys)
+                                if key_elements:
+                                    last_value = _first(_XP_VALUE, key_elements[-1])
+                                    if last_value is not None:
+                                        constraints_by_propname.setdefault(last_value.text, []).append(constraint_set)
+    return constraints_by_propname
+
+def _parse_constraint(constraint_set):
+    """
+    Builds the constraint dict of a PropertyConstraintContainer.
+    Returns None when every field is empty.
+    """
+    constraint_type = None
+    conditional_type = None
+    property_constraint_ID = None
+    property_constraint_unit = None
+    property_constraint_value = None
+
+    for property_elements in _XP_CHILD_PROPERTIES(constraint_set):
+        property_element_semantic_id = _first(_XP_SEMANTIC_ID, property_elements)
+        if property_element_semantic_id is not None:
+            sid_text = property_element_semantic_id.text
+            if _SEM_CONSTRAINT_TYPE in sid_text:
+                val = _first(_XP_VALUE, property_elements)
+                constraint_type = _text(val)
+            elif _SEM_CONDITIONAL_TYPE in sid_text:
+                val = _first(_XP_VALUE, property_elements)
+                conditional_type = _text(val)
+            elif _SEM_BASIC_CONSTRAINT in sid_text:
+                cid = _first(_XP_SUPPLEMENTAL_ID, property_elements)
+                u = _first(_XP_UNIT, property_elements)
+                q = _first(_XP_QUALIFIER, property_elements)
+                cv = _first(_XP_VALUE, property_elements)
+                property_constraint_ID = _text(cid)
+                property_constraint_unit = _text(u)
+                raw_val = _text(cv) or ""
+                q_val = _text(q)
+                # An empty <value/> yields no constraint value, not a bare operator
+                if raw_val:
+                    property_constraint_value = _intern(_QUAL_OP.get(q_val, "") + raw_val)
+                else:
+                    property_constraint_value = ""
+
+    constraint = {
+        'conditional_type': conditional_type if conditional_type else "",
+        'constraint_type': constraint_type if constraint_type else "",
+        'property_constraint_ID': property_constraint_ID if property_constraint_ID else "",
+        'property_constraint_unit': property_constraint_unit if property_constraint_unit else "",
+        'property_constraint_value': property_constraint_value if property_constraint_value else ""
+    }
+    if any(v != "" for v in constraint.values()):
+        return constraint
+    return None
+
+
+_intern = sys.intern
+
+
+def _text(element, default=""):
+    """
+    Interned text of an optional element, or *default* when the element is missing.
+    Interning lets the many identical ids, units and value types across the
+    parsed files share one string object.
+    """
+    if element is None:
+        return default
+    text = element.text
+    return _intern(text) if text is not None else None
+
+
+class _ContainerContext:
+    """
+    State shared by the helpers parsing one capability container: its PropertySet
+    and CapabilityRelations collections and the lazily built constraint index.
+    """
+    __slots__ = ('container', 'property_sets', 'relations', 'constraints_by_propname', 'parsed_constraints')
+
+    def __init__(self, container):
+        self.container = container
+        # A single walk over the container's collections buckets them once; the
+        # property, constraint and relation passes all draw from these lists
+        # instead of re-walking the container subtree.
+        self.property_sets = []
+        self.relations = []
+        for collection in container.iterdescendants(_COLLECTION_TAG):
+            # PropertySets are recognised by their first value, relations by
+            # their semanticId
+            first_value = _first(_XP_ANY_VALUE, collection)
+            if first_value is not None and _SEM_PROPERTY_SET in first_value.text:
+                self.property_sets.append(collection)
+            collection_semantic_id = _first(_XP_SEMANTIC_ID, collection)
+            if collection_semantic_id is not None and _SEM_CAPABILITY_RELATIONS in collection_semantic_id.text:
+                self.relations.append(collection)
+        # Constraint containers bucketed by the property they refer to; built on
+        # the first range property and shared by all of them.
+        self.constraints_by_propname = None
+        self.parsed_constraints = {}
+
+
+def _parse_constraints_for(ctx, prop_name):
+    """Constraint dicts of all PropertyConstraintContainers referring to prop_name."""
+    if ctx.constraints_by_propname is None:
+        ctx.constraints_by_propname = _index_constraint_containers(ctx.relations)
+    constraints = []
+    if prop_name is not None:
+        parsed_constraints = ctx.parsed_constraints
+        for constraint_set in ctx.constraints_by_propname.get(prop_name.text, ()):
+            if constraint_set not in parsed_constraints:
+                parsed_constraints[constraint_set] = _parse_constraint(constraint_set)
+            constraint = parsed_constraints[constraint_set]
+            if constraint is not None:
+                constraints.append(dict(constraint))
+    return constraints
+
+
+def _parse_range_property(ctx, property_container, property_type_range):
+    prop_name = _first(_XP_ID_SHORT, property_type_range)
+    prop_id = _first(_XP_SUPPLEMENTAL_ID, property_type_range)
+    unit = _first(_XP_UNIT, property_type_range)
+    vtype = _first(_XP_VALUE_TYPE, property_type_range)
+    min_val = _first(_XP_MIN, property_type_range)
+    max_val = _first(_XP_MAX, property_type_range)
+    prop_comment = _first(_XP_COMMENT, property_container)
+    prop_relBy = _first(_XP_PROP_REALIZED_BY, property_container)
+
+    return {
+        'property_name': _text(prop_name),
+        'property_comment': _text(prop_comment),
+        'property_ID': _text(prop_id),
+        'property_unit': _text(unit),
+        'valueType': _text(vtype),
+        'valueMin': _text(min_val),
+        'valueMax': _text(max_val),
+        'propertyRealizedBy': _text(prop_relBy),
+        'property_constraint': _parse_constraints_for(ctx, prop_name)
+    }
+
+
+def _parse_list_property(property_container, property_type_submodelElementList):
+    prop_name = _first(_XP_ID_SHORT, property_type_submodelElementList)
+    prop_id = _first(_XP_SUPPLEMENTAL_ID, property_type_submodelElementList)
+    unit = _first(_XP_UNIT, property_type_submodelElementList)
+    vtype = _first(_XP_VALUE_TYPE_LIST, property_type_submodelElementList)
+    prop_comment = _first(_XP_COMMENT, property_container)
+    prop_relBy = _first(_XP_PROP_REALIZED_BY, property_container)
+
+    result = {
+        'property_name': _text(prop_name),
+        'property_comment': _text(prop_comment),
+        'property_ID': _text(prop_id),
+        'property_unit': _text(unit),
+        'valueType': _text(vtype)
+    }
+    for i, val_elem in enumerate(_XP_CHILD_PROPERTIES(property_type_submodelElementList)):
+        result[f"value{i}"] = _text(_first(_XP_VALUE, val_elem))
+    result['property_realized_by'] = _text(prop_relBy)
+    return result
+
+
+def _parse_properties(ctx):
+    properties = []
+    for property_sets in ctx.property_sets:
+        for property_container in _XP_ALL_COLLECTIONS(property_sets):
+            # Range Properties
+            property_type_range = _first(_XP_RANGE, property_container)
+            if property_type_range is not None:
+                properties.append(_parse_range_property(ctx, property_container, property_type_range))
+
+            # SubmodelElementList Properties
+            property_type_submodelElementList = _first(_XP_LIST, property_container)
+            if property_type_submodelElementList is not None:
+                properties.append(_parse_list_property(property_container, property_type_submodelElementList))
+    return properties
+
+
+def _parse_relations(ctx):
+    """Returns the (generalized_by, realized_by) lists of a capability container."""
+    generalized_by = []
+    realized_by = []
+    for capability_relations in ctx.relations:
+        for generalized_by_sets in _XP_CHILD_COLLECTIONS(capability_relations):
+            generalized_by_semantic_id = _first(_XP_SEMANTIC_ID, generalized_by_sets)
+            if generalized_by_semantic_id is not None and _SEM_GENERALIZED_BY_SET in generalized_by_semantic_id.text:
+                for relationship_generalized_by in _XP_CHILD_RELATIONSHIPS(generalized_by_sets):
+                    second_keys = _first(_XP_SECOND_KEYS, relationship_generalized_by)
+                    if second_keys is not None:
+                        key_elements = _XP_KEY(second_keys)
+                        if key_elements:
+                            last_value = _first(_XP_VALUE, key_elements[-1])
+                            if last_value is not None:
+                                generalized_by.append(_text(last_value))
+        for relationship_realized_by in _XP_CHILD_RELATIONSHIPS(capability_relations):
+            realized_by_semantic_id = _first(_XP_SEMANTIC_ID, relationship_realized_by)
+            if realized_by_semantic_id is not None and _SEM_CAPABILITY_REALIZED_BY in realized_by_semantic_id.text:
+                realized_by_value = _first(_XP_SECOND_VALUE, relationship_realized_by)
+                if realized_by_value is not None:
+                    realized_by.append(_text(realized_by_value))
+    return generalized_by, realized_by
+
+
+def _parse_capability(ctx, capability_element):
+    capability_element_name = _first(_XP_ID_SHORT, capability_element)
+    capability_element_reference = _first(_XP_SUPPLEMENTAL_ID, capability_element)
+    capability_comment = _first(_XP_COMMENT, ctx.container)
+
+    properties = _parse_properties(ctx)
+    # Relations (GeneralizedBy / RealizedBy)
+    generalized_by, realized_by = _parse_relations(ctx)
+
+    return {
+        'capability': [{
+            'capability_name': _text(capability_element_name, "Unknown"),
+            'capability_comment': _text(capability_comment),
+            'capability_ID': _text(capability_element_reference)
+        }],
+        'properties': properties,
+        'generalized_by': generalized_by,
+        'realized_by': realized_by
+    }
+
+
+def _process_submodel(capability_SM):
+    """
+    Extracts the capabilities of a single submodel. Returns an empty list when the
+    submodel is not a CapabilityDescription submodel.
+    """
+    if not _XP_IS_CAPABILITY_SUBMODEL(capability_SM):
+        return []
+
+    capabilities = []
+    for capability_sets in _XP_CAP_SETS(capability_SM):
+        for capability_container in _XP_CHILD_COLLECTIONS(capability_sets):
+            capability_elements = _XP_CAPABILITIES(capability_container)
+            if not capability_elements:
+                continue
+
+            ctx = _ContainerContext(capability_container)
+            for capability_element in capability_elements:
+                capabilities.append(_parse_capability(ctx, capability_element))
+
+    return capabilities
+
+
+def _iter_submodels(source):
+    """
+    Streams the submodels of an AAS document with iterparse. Each outermost submodel
+    is yielded once fully parsed (followed by any submodels nested inside it, in
+    document order) and is then cleared together with its already processed
+    siblings, so only one submodel subtree is held in memory at a time.
+    """
+    # huge_tree lifts libxml2's size limits (large embedded files/values);
+    # collect_ids=False skips the xml:id index, which nothing here uses.
+    events = ET.iterparse(source, events=('end',), tag=_SUBMODEL_TAG,
+                          huge_tree=True, collect_ids=False)
+    for _, submodel in events:
+        if next(submodel.iterancestors(_SUBMODEL_TAG), None) is not None:
+            # Nested submodel: handled together with its outermost ancestor
+            continue
+        if submodel.getparent() is not None:
+            yield submodel
+        yield from _XP_SUBMODELS(submodel)
+
+        submodel.clear()
+        while submodel.getprevious() is not None:
+            del submodel.getparent()[0]
+
+
+def _aasx_relationship_target(z, rels_name, rel_type_suffix, base_dir=""):
+    """
+    Returns the part names targeted by the relationships of type *rel_type_suffix*
+    in the OPC relationships part *rels_name* (relative targets resolved against
+    *base_dir*). Missing or malformed relationship parts yield no targets.
+    """
+    try:
+        rels_root = ET.fromstring(z.read(rels_name))
+    except (KeyError, ET.XMLSyntaxError):
+        return []
+    targets = []
+    for rel in rels_root.iter(_OPC_RELATIONSHIP_TAG):
+        target = rel.get("Target")
+        if target and rel.get("Type", "").endswith(rel_type_suffix):
+            if target.startswith("/"):
+                targets.append(target[1:])
+            else:
+                targets.append(posixpath.normpath(posixpath.join(base_dir, target)))
+    return targets
+
+
+def _find_aasx_spec_part(z):
+    """
+    Locates the AAS XML part of an AASX package. The package origin is followed to
+    its aas-spec relationship as defined by the AASX format; packages without
+    usable relationships fall back to the first XML part outside _rels and
+    [Content_Types].xml. Returns None when the package holds no XML part.
+    """
+    names = set(z.namelist())
+    for origin in _aasx_relationship_target(z, "_rels/.rels", "/aasx-origin"):
+        origin_dir, _, origin_file = origin.rpartition("/")
+        origin_rels = posixpath.join(origin_dir, "_rels", origin_file + ".rels")
+        for spec in _aasx_relationship_target(z, origin_rels, "/aas-spec", origin_dir):
+            if spec.endswith('.xml') and spec in names:
+                return spec
+
+    return next(
+        (f for f in z.namelist()
+         if f.endswith('.xml')
+         and not f.startswith('_rels')
+         and '[Content_Types]' not in f),
+        None
+    )
+
+
+def _report_read_error(file_path, is_aasx, e):
+    """Prints why an AAS file could not be read or parsed."""
+    if is_aasx:
+        if isinstance(e, zipfile.BadZipFile):
+            print(f"Error: File is corrupted or not a valid AASX package: {file_path}")
+        else:
+            print(f"Error processing AASX file {file_path}: {e}")
+    elif isinstance(e, ET.XMLSyntaxError):
+        print(f"Error parsing XML file {file_path}: {e}")
+    else:
+        print(f"Error reading file {file_path}: {e}")
+
+
 def parse_capabilities_robust(file_path):
     """
     Parses an AAS file (XML or AASX format) and extracts capabilities.
+    Results are cached per file version (device, inode, mtime, ctime and size),
+    so parsing an unchanged file again returns a copy of the earlier result.
+    Files that fail to read or parse are not cached and report their error on
+    every call.
     """
-    
-    tree = None
+    # Copied so callers may modify the result without corrupting the cache
+    return deepcopy(_parse_capabilities_shared(file_path))
+
+
+def _parse_capabilities_shared(file_path):
+    """Cached parse result itself; callers must not modify it."""
+    try:
+        st = os.stat(file_path)
+    except (OSError, TypeError, ValueError):
+        # Unreadable path: let the parser report it
+        return _parse_capabilities_uncached(file_path)
+    try:
+        return _parse_capabilities_cached(
+            str(file_path), st.st_dev, st.st_ino, st.st_mtime_ns, st.st_ctime_ns, st.st_size)
+    except _ParseFailed:
+        return []
+
+
+@lru_cache(maxsize=128)
+def _parse_capabilities_cached(file_path, st_dev, st_ino, mtime_ns, ctime_ns, size):
+    # _ParseFailed propagates, and lru_cache does not store raised calls
+    return _parse_file(file_path)
+
+
+class _ParseFailed(Exception):
+    """Raised by _parse_file after a read/parse error has been reported."""
+
+
+def _parse_capabilities_uncached(file_path):
+    """Parses without the cache; read/parse errors are reported and yield []."""
+    try:
+        return _parse_file(file_path)
+    except _ParseFailed:
+        return []
+
+
+def _parse_file(file_path):
     file_path_str = str(file_path)
-    
-    # -------------------------------------------------------
-    # Handle .aasx (ZIP archive) and standard .xml
-    # -------------------------------------------------------
-    if file_path_str.lower().endswith('.aasx'):
+    is_aasx = file_path_str.lower().endswith('.aasx')
+    capabilities = []
+
+    with ExitStack() as stack:
+        # -------------------------------------------------------
+        # Handle .aasx (ZIP archive) and standard .xml
+        # -------------------------------------------------------
         try:
-            with zipfile.ZipFile(file_path, 'r') as z:
+            if is_aasx:
+                z = stack.enter_context(zipfile.ZipFile(file_path, 'r'))
                 # Find the main XML file inside the archive
-                xml_files = [
-                    f for f in z.namelist() 
-                    if f.endswith('.xml') 
-                    and not f.startswith('_rels') 
-                    and '[Content_Types]' not in f
-                ]
-                
-                if not xml_files:
+                target_xml = _find_aasx_spec_part(z)
+                if target_xml is None:
                     print(f"Warning: No valid XML found in AASX package: {file_path}")
-                    return []
-                
-                # Use the first found XML file
-                target_xml = xml_files[0]
-                
-                # Read and parse directly from the zip stream
-                with z.open(target_xml) as f:
-                    tree = ET.parse(f)
-        except zipfile.BadZipFile:
-            print(f"Error: File is corrupted or not a valid AASX package: {file_path}")
-            return []
+                    raise _ParseFailed()
+
+                # Stream the AAS XML directly from the zip
+                source = stack.enter_context(z.open(target_xml))
+            else:
+                source = file_path
+            submodels = _iter_submodels(source)
+        except _ParseFailed:
+            # Already reported above
+            raise
         except Exception as e:
-            print(f"Error processing AASX file {file_path}: {e}")
-            return []
-    else:
-        # Standard XML file parsing
+            _report_read_error(file_path, is_aasx, e)
+            raise _ParseFailed()
+
+        # -------------------------------------------------------
+        # Core Parsing Logic
+        # -------------------------------------------------------
+        # Only reading/parsing errors are reported here; errors raised while
+        # extracting a submodel propagate to the caller as before.
+        while True:
+            try:
+                capability_SM = next(submodels, None)
+            except Exception as e:
+                _report_read_error(file_path, is_aasx, e)
+                raise _ParseFailed()
+            if capability_SM is None:
+                break
+            capabilities.extend(_process_submodel(capability_SM))
+
+    return capabilities
+
+
+def parse_capabilities_robust_json(file_path):
+    """
+    Parses an AAS file and returns its capabilities as UTF-8 encoded JSON bytes.
+    Serialises the cached result directly; the bytes are immutable, so no
+    defensive copy is needed.
+    """
+    capabilities = _parse_capabilities_shared(file_path)
+    return json.dumps(capabilities, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def parse_capabilities_safe(file_path, cached=True):
+    """
+    Wrapper for worker pools: never raises, returns (capabilities, error_message).
+    Module-level so it can be pickled into a ProcessPoolExecutor. Pass
+    cached=False in worker processes, whose cache would die with them.
+    """
+    try:
+        if cached:
+            return parse_capabilities_robust(file_path), None
+        return _parse_capabilities_uncached(file_path), None
+    except Exception as e:
+        return None, str(e)
+
+
+# Below this much data a process pool costs more to start (one interpreter
+# per worker) than parsing everything in the calling thread
+PARALLEL_PARSE_MIN_BYTES = 8 * 1024 * 1024
+
+
+def _total_size(paths):
+    total = 0
+    for p in paths:
         try:
-            tree = ET.parse(file_path)
-        except ET.ParseError as e:
-            print(f"Error parsing XML file {file_path}: {e}")
-            return []
-        except Exception as e:
-            print(f"Error reading file {file_path}: {e}")
-            return []
+            total += os.path.getsize(p)
+        except OSError:
+            pass
+    return total
 
-    # -------------------------------------------------------
-    # Core Parsing Logic
-    # -------------------------------------------------------
-    root = tree.getroot()
-    ns = {'aas': 'https://admin-shell.io/aas/3/0'}
 
-    capabilities = []
+def _parse_in_pool(ex, paths, progress_callback, cached=True):
+    # Process workers pass cached=False: their parse cache dies with them
+    futures = {ex.submit(parse_capabilities_safe, p, cached): i for i, p in enumerate(paths)}
+    results = [None] * len(paths)
+    for done, fut in enumerate(as_completed(futures), 1):
+        results[futures[fut]] = fut.result()
+        if progress_callback:
+            progress_callback(done, len(paths))
+    return results
+
+
+def parse_capabilities_many(paths, workers=None, progress_callback=None):
+    """
+    Parses several AAS files and returns {path: (capabilities, error_message)},
+    one parse_capabilities_safe result per file, so one bad file does not
+    abort the batch. progress_callback(done, total) is called as files finish.
+
+    The extraction loops hold the GIL, so separate processes are used once
+    there is enough data to pay for starting them; a single worker or small
+    batches are parsed in the calling process, through its cache. Each pool
+    worker is a process with its own cache that dies with it, so workers parse
+    uncached. Falls back to threads where a process pool cannot be started
+    (e.g. restricted or frozen environments).
+    """
+    paths = list(paths)
+    max_workers = min(32, len(paths), workers or os.cpu_count() or 4)
+    if max_workers <= 1 or _total_size(paths) < PARALLEL_PARSE_MIN_BYTES:
+        results = []
+        for p in paths:
+            results.append(parse_capabilities_safe(p))
+            if progress_callback:
+                progress_callback(len(results), len(paths))
+        return dict(zip(paths, results))
 
-    # Iterate through all Submodels
-    for capability_SM in root.findall(".//aas:submodel", ns):
-        capability_SM_value = capability_SM.find(".//aas:value", ns)
-        
-        if capability_SM_value is not None and "https://admin-shell.io/idta/CapabilityDescription/1/0/Submodel" in capability_SM_value.text:
-            
-            for capability_sets in capability_SM.findall("aas:submodelElements/aas:submodelElementCollection", ns):
-                for capability_container in capability_sets.findall("aas:value/aas:submodelElementCollection", ns):
-                    for capability_element in capability_container.findall("aas:value/aas:capability", ns):
-                        if capability_element is not None:
-                            capability_element_name = capability_element.find("aas:idShort", ns)
-                            capability_element_reference = capability_element.find("aas:supplementalSemanticIds//aas:value", ns)
-                            capability_comment = capability_container.find("aas:value/aas:multiLanguageProperty/aas:value//aas:text", ns)
-                            
-                            capability = {
-                                'capability': [],
-                                'properties': [],
-                                'generalized_by': [],
-                                'realized_by': []
-                            }
-
-                            capability['capability'].append({
-                                'capability_name': capability_element_name.text if capability_element_name is not None else "Unknown",
-                                'capability_comment': capability_comment.text if capability_comment is not None else "",
-                                'capability_ID': capability_element_reference.text if capability_element_reference is not None else ""
-                            })
-
-                            # Process Properties
-                            for property_sets in capability_container.findall(".//aas:submodelElementCollection", ns):
-                                property_sets_value = property_sets.find(".//aas:value", ns)
-                                if property_sets_value is not None and "https://admin-shell.io/idta/CapabilityDescription/PropertySet/1/0" in property_sets_value.text:
-                                    for property_container in property_sets.findall(".//aas:submodelElementCollection", ns):
-
-                                        # Range Properties
-                                        property_type_range = property_container.find("aas:value/aas:range", ns)
-                                        if property_type_range is not None:
-                                            # ... (Extraction logic identical to previous versions) ...
-                                            prop_name = property_type_range.find("aas:idShort", ns)
-                                            prop_id = property_type_range.find("aas:supplementalSemanticIds//aas:value", ns)
-                                            unit = property_type_range.find("aas:embeddedDataSpecifications//aas:value", ns)
-                                            vtype = property_type_range.find("aas:valueType", ns)
-                                            min_val = property_type_range.find("aas:min", ns)
-                                            max_val = property_type_range.find("aas:max", ns)
-                                            prop_comment = property_container.find("aas:value/aas:multiLanguageProperty/aas:value//aas:text", ns)
-                                            prop_relBy = property_container.find("aas:value/aas:relationshipElement/aas:second//aas:value", ns)
-
-                                            prop_entry = {
-                                                'property_name': prop_name.text if prop_name is not None else "",
-                                                'property_comment': prop_comment.text if prop_comment is not None else "",
-                                                'property_ID': prop_id.text if prop_id is not None else "",
-                                                'property_unit': unit.text if unit is not None else "",
-                                                'valueType': vtype.text if vtype is not None else "",
-                                                'valueMin': min_val.text if min_val is not None else "",
-                                                'valueMax': max_val.text if max_val is not None else "",
-                                                'propertyRealizedBy': prop_relBy.text if prop_relBy is not None else "",
-                                                'property_constraint': []
-                                            }
-                                            
-                                            # Constraints Logic
-                                            for capability_relations in capability_container.findall(".//aas:submodelElementCollection", ns):
-                                                capability_relations_semantic_id = capability_relations.find("aas:semanticId//aas:value", ns)
-                                                if capability_relations_semantic_id is not None and "https://admin-shell.io/idta/CapabilityDescription/CapabilityRelations/1/0" in capability_relations_semantic_id.text:
-                                                    for constraint_sets in capability_relations.findall("aas:value/aas:submodelElementCollection", ns):
-                                                        constraint_set_semantic_id = constraint_sets.find("aas:semanticId//aas:value", ns)
-                                                        if constraint_set_semantic_id is not None and "https://admin-shell.io/idta/CapabilityDescription/ConstraintSet/1/0" in constraint_set_semantic_id.text:
-                                                            for constraint_set in constraint_sets.findall("aas:value/aas:submodelElementCollection", ns):
-                                                                constraint_set_semantic_id = constraint_set.find("aas:semanticId//aas:value", ns)
-                                                                if constraint_set_semantic_id is not None and "https://admin-shell.io/idta/CapabilityDescription/PropertyConstraintContainer/1/0" in constraint_set_semantic_id.text:
-                                                                    for relationship_constraint in constraint_set.findall("aas:value/aas:submodelElementCollection/aas:value/aas:relationshipElement", ns):
-                                                                        second_keys = relationship_constraint.find("aas:second/aas:keys", ns)
-                                                                        if second_keys is not None:
-                                                                            key_elements = second_keys.findall("aas:key", ns)
-                                                                            if key_elements:
-                                                                                last_key = key_elements[-1]
-                                                                                last_value = last_key.find("aas:value", ns)
-                                                                                if last_value is not None and prop_name is not None and last_value.text == prop_name.text:
-                                                                                    # Parse constraint details
-                                                                                    constraint_type = None
-                                                                                    conditional_type = None
-                                                                                    property_constraint_ID = None
-                                                                                    property_constraint_unit = None
-                                                                                    property_constraint_value = None
-
-                                                                                    for property_elements in constraint_set.findall("aas:value/aas:property", ns):
-                                                                                        property_element_semantic_id = property_elements.find("aas:semanticId//aas:value", ns)
-                                                                                        if property_element_semantic_id is not None:
-                                                                                            sid_text = property_element_semantic_id.text
-                                                                                            if "ConstraintType/1/0" in sid_text:
-                                                                                                val = property_elements.find("aas:value", ns)
-                                                                                                constraint_type = val.text if val is not None else ""
-                                                                                            elif "PropertyConditionalType/1/0" in sid_text:
-                                                                                                val = property_elements.find("aas:value", ns)
-                                                                                                conditional_type = val.text if val is not None else ""
-                                                                                            elif "BasicConstraint/1/0" in sid_text:
-                                                                                                cid = property_elements.find("aas:supplementalSemanticIds//aas:value", ns)
-                                                                                                u = property_elements.find("aas:embeddedDataSpecifications//aas:value", ns)
-                                                                                                q = property_elements.find("aas:qualifiers//aas:value", ns)
-                                                                                                cv = property_elements.find("aas:value", ns)
-                                                                                                property_constraint_ID = cid.text if cid is not None else ""
-                                                                                                property_constraint_unit = u.text if u is not None else ""
-                                                                                                raw_val = cv.text if cv is not None else ""
-                                                                                                q_val = q.text if q is not None else ""
-                                                                                                if q_val == "GREATER_THAN_0": property_constraint_value = ">" + raw_val
-                                                                                                elif q_val == "GREATER_EQUAL_1": property_constraint_value = ">=" + raw_val
-                                                                                                elif q_val == "EQUAL_2": property_constraint_value = "==" + raw_val
-                                                                                                elif q_val == "NOT_EQUAL_3": property_constraint_value = "!=" + raw_val
-                                                                                                elif q_val == "LESS_EQUAL_4": property_constraint_value = "<=" + raw_val
-                                                                                                elif q_val == "LESS_THAN_5": property_constraint_value = "<" + raw_val
-                                                                                                else: property_constraint_value = raw_val
-
-                                                                                    constraint = {
-                                                                                        'conditional_type': conditional_type if conditional_type else "",
-                                                                                        'constraint_type': constraint_type if constraint_type else "",
-                                                                                        'property_constraint_ID': property_constraint_ID if property_constraint_ID else "",
-                                                                                        'property_constraint_unit': property_constraint_unit if property_constraint_unit else "",
-                                                                                        'property_constraint_value': property_constraint_value if property_constraint_value else ""
-                                                                                    }
-                                                                                    if any(v != "" for v in constraint.values()):
-                                                                                        prop_entry['property_constraint'].append(constraint)
-                                            capability['properties'].append(prop_entry)
-
-                                        # SubmodelElementList Properties
-                                        property_type_submodelElementList = property_container.find("aas:value/aas:submodelElementList", ns)
-                                        if property_type_submodelElementList is not None:
-                                            prop_name = property_type_submodelElementList.find("aas:idShort", ns)
-                                            prop_id = property_type_submodelElementList.find("aas:supplementalSemanticIds//aas:value", ns)
-                                            unit = property_type_submodelElementList.find("aas:embeddedDataSpecifications//aas:value", ns)
-                                            vtype = property_type_submodelElementList.find("aas:valueTypeListElement", ns)
-                                            prop_comment = property_container.find("aas:value/aas:multiLanguageProperty/aas:value//aas:text", ns)
-                                            prop_relBy = property_container.find("aas:value/aas:relationshipElement/aas:second//aas:value", ns)
-
-                                            result = {
-                                                'property_name': prop_name.text if prop_name is not None else "",
-                                                'property_comment': prop_comment.text if prop_comment is not None else "",
-                                                'property_ID': prop_id.text if prop_id is not None else "",
-                                                'property_unit': unit.text if unit is not None else "",
-                                                'valueType': vtype.text if vtype is not None else ""
-                                            }
-                                            value_list = property_type_submodelElementList.findall("aas:value/aas:property", ns)
-                                            for i, val_elem in enumerate(value_list):
-                                                val = val_elem.find("aas:value", ns)
-                                                result[f"value{i}"] = val.text if val is not None else ""
-                                            result['property_realized_by'] = prop_relBy.text if prop_relBy is not None else ""
-                                            capability['properties'].append(result)
-
-                            # Relations (GeneralizedBy / RealizedBy)
-                            for capability_relations in capability_container.findall(".//aas:submodelElementCollection", ns):
-                                capability_relations_semantic_id = capability_relations.find("aas:semanticId//aas:value", ns)
-                                if capability_relations_semantic_id is not None and "https://admin-shell.io/idta/CapabilityDescription/CapabilityRelations/1/0" in capability_relations_semantic_id.text:
-                                    for generalized_by_sets in capability_relations.findall("aas:value/aas:submodelElementCollection", ns):
-                                        generalized_by_semantic_id = generalized_by_sets.find("aas:semanticId//aas:value", ns)
-                                        if generalized_by_semantic_id is not None and "GeneralizedBySet/1/0" in generalized_by_semantic_id.text:
-                                            for relationship_generalized_by in generalized_by_sets.findall("aas:value/aas:relationshipElement", ns):
-                                                second_keys = relationship_generalized_by.find("aas:second/aas:keys", ns)
-                                                if second_keys is not None:
-                                                    key_elements = second_keys.findall("aas:key", ns)
-                                                    if key_elements:
-                                                        last_key = key_elements[-1]
-                                                        last_value = last_key.find("aas:value", ns)
-                                                        if last_value is not None:
-                                                            capability['generalized_by'].append(last_value.text)
-                                    for realized_by in capability_relations.findall("aas:value/aas:relationshipElement", ns):
-                                        realized_by_semantic_id = realized_by.find("aas:semanticId//aas:value", ns)
-                                        if realized_by_semantic_id is not None and "CapabilityRealizedBy/1/0" in realized_by_semantic_id.text:
-                                            realized_by_value = realized_by.find("aas:second//aas:value", ns)
-                                            if realized_by_value is not None:
-                                                capability['realized_by'].append(realized_by_value.text)
-
-                            capabilities.append(capability)
-
-    return capabilities
\ No newline at end of file
+    try:
+        # spawn, not fork: callers may be threaded (e.g. the GUI) and forking a
+        # threaded process can deadlock the child
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx) as ex:
+            results = _parse_in_pool(ex, paths, progress_callback, cached=False)
+    except (OSError, BrokenProcessPool):
+        with ThreadPoolExecutor(max_workers=max_workers) as ex:
+            results = _parse_in_pool(ex, paths, progress_callback)
+    return dict(zip(paths, results))
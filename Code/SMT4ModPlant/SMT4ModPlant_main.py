@@ -1,11 +1,15 @@
 # Code/SMT4ModPlant/SMT4ModPlant_main.py
 import json
+import re
 from z3 import Solver, Bool, Not, Sum, If, is_true, sat, And, Int, Or
 
 # Global constants
 TRANSPORT_CAPABILITIES = ["Transfer", "Discharge"]
 DOSING_CAPABILITY = "Dosing"
 
+# Optional comparison operator followed by a number, e.g. ">=5" or "7,5"
+_CONSTRAINT_RE = re.compile(r'(>=|<=|>|<|=)?\s*([0-9\.,]+)')
+
 # ---------------------------------------------------------
 # HELPER FUNCTIONS (Condensed for brevity, logic unchanged)
 # ---------------------------------------------------------
@@ -14,55 +18,45 @@ def load_json(filename):
     with open(filename, 'r', encoding='utf-8') as f:
         return json.load(f)
 
+def _iri_tail(s):
+    if s is None:
+        return ""
+    # Support both "#" and "/" IRI styles (take the last fragment as the local name).
+    # rpartition returns the whole string when the separator is missing and
+    # does not build the intermediate list split() would
+    return str(s).strip().rpartition("#")[2].rpartition("/")[2].strip()
+
 def capability_matching(recipe_sem_id, cap_entry):
-    def tail(s):
-        if s is None:
-            return ""
-        s = str(s).strip()
-        # Support both "#" and "/" IRI styles (take the last fragment as the local name)
-        if "#" in s:
-            s = s.split("#")[-1]
-        if "/" in s:
-            s = s.split("/")[-1]
-        return s.strip()
-
-    recipe_tail = tail(recipe_sem_id)
+    recipe_tail = _iri_tail(recipe_sem_id)
 
     cap_id = cap_entry['capability'][0].get('capability_ID', '')
     cap_name = cap_entry['capability'][0].get('capability_name', '')
 
     # 1) Match by capability_ID (after extracting/normalizing the local name)
-    if tail(cap_id) == recipe_tail and recipe_tail != "":
+    if _iri_tail(cap_id) == recipe_tail and recipe_tail != "":
         return True
 
     # 2) Also allow matching by capability_name
     #    (In many AAS models, the semantic ID and the human-readable name may come from different vocabularies)
-    if tail(cap_name) == recipe_tail and recipe_tail != "":
+    if _iri_tail(cap_name) == recipe_tail and recipe_tail != "":
         return True
 
     # 3) generalized_by: normalize each entry as well and match against the recipe local name
     generalized = cap_entry.get('generalized_by', [])
     if isinstance(generalized, list):
-        if any(tail(g) == recipe_tail for g in generalized if g is not None):
+        if any(_iri_tail(g) == recipe_tail for g in generalized if g is not None):
             return True
 
     return False
 
 def property_value_match(param_value, prop):
-    import re
-    discrete_values = []
-    for k, v in prop.items():
-        if k.startswith('value') and k != 'valueType' and v is not None:
-            try:
-                discrete_values.append(float(v))
-            except (ValueError, TypeError):
-                continue
+    # Parsed once; both the range and the discrete check use it
+    match = _CONSTRAINT_RE.match(str(param_value))
 
     value_min = prop.get('valueMin')
     value_max = prop.get('valueMax')
 
     if value_min is not None or value_max is not None:
-        match = re.match(r'(>=|<=|>|<|=)?\s*([0-9\.,]+)', str(param_value))
         if match:
             op, val = match.groups()
             val = float(val.replace(',', '.'))
@@ -81,8 +75,16 @@ def property_value_match(param_value, prop):
                 except ValueError: pass
             return True
 
+    # Only collected when the range check did not already decide
+    discrete_values = []
+    for k, v in prop.items():
+        if k.startswith('value') and k != 'valueType' and v is not None:
+            try:
+                discrete_values.append(float(v))
+            except (ValueError, TypeError):
+                continue
+
     if discrete_values:
-        match = re.match(r'(>=|<=|>|<|=)?\s*([0-9\.,]+)', str(param_value))
         if match:
             op, val = match.groups()
             op = op or '='
@@ -134,8 +136,7 @@ def check_preconditions_for_step(recipe, step, cap_entry):
                 for mat in input_materials:
                     if mat.get('Key') == constraint_id and mat.get('UnitOfMeasure') == constraint_unit:
                         try:
-                            import re
-                            match = re.match(r'(>=|<=|>|<|=)?\s*([0-9\.,]+)', constraint_value_str)
+                            match = _CONSTRAINT_RE.match(constraint_value_str)
                             if match:
                                 op, val = match.groups()
                                 op = op or '='
@@ -385,6 +386,9 @@ def _build_model_and_assignments(
     step_resource_to_caps_props = [[[] for _ in resources] for _ in process_steps]
     Assignment = []
 
+    # Transport capability depends on the resource only; look it up once per resource
+    transfer_cap_by_res = {res: has_transfer_capability(res, capabilities_data) for res in resources}
+
     for i, step in enumerate(process_steps):
         row = []
 
@@ -400,19 +404,17 @@ def _build_model_and_assignments(
             varname = f"assign_{step['ID']}_r{j}_{_sanitize_resource_name(res)}"
             var = Bool(varname)
 
+            # No compatible capability found on this resource for this step.
+            valid = bool(matching_caps)
+
             # Transfer feasibility is checked here as an early pruning rule:
             # If a step might require transport, resources without transport capability are invalid.
-            transfer_needed = needs_transfer_to_step(
-                step, j, resources, step_by_id, step_resource_to_caps_props, recipe_data
-            )
-            transfer_cap = has_transfer_capability(res, capabilities_data)
-
-            valid = True
-            if transfer_needed and not transfer_cap:
-                valid = False
-            if not matching_caps:
-                # No compatible capability found on this resource for this step.
-                valid = False
+            # Only evaluated when it can still change the outcome (the link scan is the costly part).
+            if valid and not transfer_cap_by_res[res]:
+                if needs_transfer_to_step(
+                    step, j, resources, step_by_id, step_resource_to_caps_props, recipe_data
+                ):
+                    valid = False
 
             if valid:
                 step_resource_to_caps_props[i][j] = (matching_caps, matching_props)
@@ -1,9 +1,10 @@
 import json
 import uuid
+from copy import deepcopy
 from datetime import datetime
+from functools import lru_cache
 import os
-import xml.etree.ElementTree as ET
-from xml.dom import minidom
+from lxml import etree as ET
 
 # Unit mapping (MTP -> SI/QUDT IRIs -> label)
 from .mtp_unit_mapping import map_unit as map_unit_from_table
@@ -12,6 +13,38 @@ from .mtp_unit_mapping import map_unit as map_unit_from_table
 B2MML_NS = "http://www.mesa.org/xml/B2MML"
 XSI_NS = "http://www.w3.org/2001/XMLSchema-instance"
 SCHEMA_LOCATION = "http://www.mesa.org/xml/B2MML Schema/AllSchemas.xsd"
+B2MML_NSMAP = {"b2mml": B2MML_NS, "xsi": XSI_NS}
+_B2MML_TAG = f"{{{B2MML_NS}}}"
+# Written by hand to keep the double-quoted declaration of earlier exports
+_XML_DECLARATION = '<?xml version="1.0" encoding="utf-8"?>\n'
+_XML_DECLARATION_BYTES = _XML_DECLARATION.encode("utf-8")
+
+
+# Map data types
+_DATA_TYPE_MAP = {
+    "xs:int": "integer",
+    "xs:double": "double",
+    "int": "integer",
+    "double": "double",
+    "duration": "duration",
+}
+
+
+@lru_cache(maxsize=256)
+def _map_data_type(json_type):
+    return _DATA_TYPE_MAP.get(json_type, json_type)
+
+
+# Map units (via external mapping table); the table is fixed at import time
+@lru_cache(maxsize=256)
+def _map_unit(unit_uri):
+    return map_unit_from_table(unit_uri)
+
+
+@lru_cache(maxsize=256)
+def _short_resource_name(resource_key):
+    """'resource: 2025-04_HC10' -> 'HC10'; a run only has a few distinct keys."""
+    return resource_key.replace("resource: ", "").replace("2025-04_", "")
 
 
 def generate_b2mml_master_recipe(
@@ -55,25 +88,31 @@ def generate_b2mml_master_recipe(
     if not optimal_solution:
         raise ValueError(f"Optimal solution {selected_solution_id} not found in solutions data")
 
-    # --- Register namespaces to force prefix "b2mml" and keep "xsi" ---
-    # IMPORTANT: Do this BEFORE creating any elements.
-    ET.register_namespace("b2mml", B2MML_NS)
-    ET.register_namespace("xsi", XSI_NS)
-
     # --- Element creation helper (B2MML namespace) ---
+    # Every element below the root is created in place under its real parent.
+    # Free-standing ET.Element(...) + append() would make lxml reconcile the
+    # namespaces of the moved subtree on every append. The only appended
+    # subtrees are the Link copies, whose templates live under a holder with
+    # the same nsmap as the root.
+    sub_element = ET.SubElement
+
     def create_element(parent, tag, **kwargs):
-        """Create a B2MML namespaced element."""
-        return ET.SubElement(parent, f"{{{B2MML_NS}}}{tag}", **kwargs)
+        """Create a B2MML namespaced element as a child of parent."""
+        return sub_element(parent, _B2MML_TAG + tag, **kwargs)
 
     # --- Create root (B2MML namespace) ---
-    root = ET.Element(ET.QName(B2MML_NS, "BatchInformation"))
+    # nsmap forces the "b2mml" and "xsi" prefixes; SubElements inherit it
+    root = ET.Element(_B2MML_TAG + "BatchInformation", nsmap=B2MML_NSMAP)
     # schemaLocation is an xsi attribute
     root.set(ET.QName(XSI_NS, "schemaLocation"), SCHEMA_LOCATION)
 
+    # One timestamp for the whole document, so CreateDate == VersionDate
+    now_iso = datetime.now().isoformat() + "+01:00"
+
     # ListHeader
     list_header = create_element(root, "ListHeader")
     create_element(list_header, "ID").text = "ListHeadID"
-    create_element(list_header, "CreateDate").text = datetime.now().isoformat() + "+01:00"
+    create_element(list_header, "CreateDate").text = now_iso
 
     # Description
     desc = create_element(root, "Description")
@@ -86,7 +125,7 @@ def generate_b2mml_master_recipe(
     master_recipe = create_element(root, "MasterRecipe")
     create_element(master_recipe, "ID").text = f"MasterRecipe_{selected_solution_id}"
     create_element(master_recipe, "Version").text = "1.0.0"
-    create_element(master_recipe, "VersionDate").text = datetime.now().isoformat() + "+01:00"
+    create_element(master_recipe, "VersionDate").text = now_iso
 
     recipe_desc = create_element(master_recipe, "Description")
     recipe_desc.text = (
@@ -114,49 +153,48 @@ def generate_b2mml_master_recipe(
     formula = create_element(master_recipe, "Formula")
 
     # Helper: Find propertyRealizedBy from resource data
+    # Per resource: capability_name -> [(by_name, by_lower_name), ...], one
+    # pair per capability block in resource order. First occurrence wins in
+    # each dict, like the scan it replaces. Built on first use of a resource.
+    prop_index_by_resource = {}
+
+    def _index_resource_properties(resource_caps):
+        index = {}
+        if not isinstance(resource_caps, list):
+            return index
+        for capability_data in resource_caps:
+            by_name = {}
+            by_lower = {}
+            for prop in capability_data.get("properties", []):
+                name = prop.get("property_name")
+                realized_by = prop.get("propertyRealizedBy")
+                by_name.setdefault(name, realized_by)
+                by_lower.setdefault((name or "").lower(), realized_by)
+            cap_names = {cap.get("capability_name") for cap in capability_data.get("capability", [])}
+            for cap_name in cap_names:
+                index.setdefault(cap_name, []).append((by_name, by_lower))
+        return index
+
     def find_property_realized_by(resource_name, capability_name, property_name):
         if resource_name not in resources_data:
             return None
 
-        resource_caps = resources_data[resource_name]
-        if isinstance(resource_caps, list):
-            for capability_data in resource_caps:
-                # Check capability name
-                cap_match = False
-                if "capability" in capability_data:
-                    for cap in capability_data["capability"]:
-                        if cap.get("capability_name") == capability_name:
-                            cap_match = True
-                            break
-
-                if not cap_match:
-                    continue
+        index = prop_index_by_resource.get(resource_name)
+        if index is None:
+            index = prop_index_by_resource[resource_name] = _index_resource_properties(
+                resources_data[resource_name]
+            )
 
-                # Search in properties
-                for prop in capability_data.get("properties", []):
-                    if prop.get("property_name") == property_name:
-                        return prop.get("propertyRealizedBy")
-
-                # Fallback: case-insensitive by property_name
-                for prop in capability_data.get("properties", []):
-                    if prop.get("property_name", "").lower() == property_name.lower():
-                        return prop.get("propertyRealizedBy")
+        for by_name, by_lower in index.get(capability_name, ()):
+            if property_name in by_name:
+                return by_name[property_name]
+            # Fallback: case-insensitive by property_name
+            lower_name = property_name.lower()
+            if lower_name in by_lower:
+                return by_lower[lower_name]
 
         return None
 
-    # Map data types
-    def map_data_type(json_type):
-        mapping = {
-            "xs:int": "integer",
-            "xs:double": "double",
-            "int": "integer",
-            "double": "double",
-            "duration": "duration",
-        }
-        return mapping.get(json_type, json_type)
-    # Map units (via external mapping table)
-    def map_unit(unit_uri):
-        return map_unit_from_table(unit_uri)
     # Store parameter mapping - global parameter counter
     param_mapping = {}
     global_param_counter = 1
@@ -165,48 +203,144 @@ def generate_b2mml_master_recipe(
     if "ProcessElements" not in general_recipe_data:
         raise ValueError("General recipe data must contain 'ProcessElements'")
 
-    # Process all parameters first, assign unique ID for each parameter
+    # step_id -> assignment; the first assignment of a step wins
+    assignment_by_step = {}
+    for a in optimal_solution.get("assignments", []):
+        assignment_by_step.setdefault(a.get("step_id"), a)
+
+    # ProcedureLogic follows Formula in the document; create it up front so
+    # Parameters and steps can be collected in one pass over ProcessElements
+    procedure_logic = create_element(master_recipe, "ProcedureLogic")
+
+    # Every Link has the same fixed shape, so build it once per direction and
+    # deep-copy it (one C-level copy instead of 14 SubElement calls), patching
+    # only the ID and the two endpoint values.
+    link_holder = ET.Element(_B2MML_TAG + "ProcedureLogic", nsmap=B2MML_NSMAP)
+
+    def make_link_template(from_type, to_type):
+        link = create_element(link_holder, "Link")
+        create_element(link, "ID")
+
+        from_id = create_element(link, "FromID")
+        create_element(from_id, "FromIDValue")
+        create_element(from_id, "FromType").text = from_type
+        create_element(from_id, "IDScope").text = "External"
+
+        to_id = create_element(link, "ToID")
+        create_element(to_id, "ToIDValue")
+        create_element(to_id, "ToType").text = to_type
+        create_element(to_id, "IDScope").text = "External"
+
+        create_element(link, "LinkType").text = "ControlLink"
+        create_element(link, "Depiction").text = "LineAndArrow"
+        create_element(link, "EvaluationOrder").text = "1"
+        create_element(link, "Description").text = "string"
+        return link
+
+    step_to_transition = make_link_template("Step", "Transition")
+    transition_to_step = make_link_template("Transition", "Step")
+
+    # ProcedureLogic lists all Links, then all Steps, then all Transitions.
+    # Each step is written as soon as it is known: its Links go in front of
+    # the first Step, the Step in front of the first Transition and its
+    # Transition at the end.
+    first_step = None
+    first_transition = None
+    prev_step = None  # (id, description) of the last step written
+    transition_count = 0
+
+    def add_link(template, link_id, from_value, to_value):
+        link = deepcopy(template)
+        link[0].text = link_id
+        link[1][0].text = from_value
+        link[2][0].text = to_value
+        first_step.addprevious(link)
+
+    def add_step(step_id, recipe_element_id, description):
+        nonlocal first_step, first_transition, prev_step, transition_count
+
+        step_elem = create_element(procedure_logic, "Step")
+        create_element(step_elem, "ID").text = step_id
+        create_element(step_elem, "RecipeElementID").text = recipe_element_id
+        create_element(step_elem, "RecipeElementVersion")
+        create_element(step_elem, "Description").text = description
+
+        if prev_step is None:
+            first_step = step_elem
+        else:
+            # Previous step -> Transition -> this step
+            transition_count += 1
+            transition_id = f"T{transition_count}"
+            add_link(step_to_transition, f"L{2 * transition_count - 1}", prev_step[0], transition_id)
+            add_link(transition_to_step, f"L{2 * transition_count}", transition_id, step_id)
+
+            if first_transition is not None:
+                first_transition.addprevious(step_elem)
+
+            transition = create_element(procedure_logic, "Transition")
+            create_element(transition, "ID").text = transition_id
+            if transition_count == 1:
+                create_element(transition, "Condition").text = "True"
+            else:
+                create_element(transition, "Condition").text = f"Step {prev_step[1]} is Completed"
+
+            if first_transition is None:
+                first_transition = transition
+
+        prev_step = (step_id, description)
+
+    # 1) Start step
+    add_step("S1", "Init", "Init")
+
+    # 2) Formula Parameters and operation steps in ProcessElements order
+    step_counter = 2
+    recipe_element_counter = 1
+
     for pe in general_recipe_data["ProcessElements"]:
+        step_id = f"S{step_counter}"
+
         # Find corresponding assignment in the selected solution
-        assignment = None
-        for a in optimal_solution.get("assignments", []):
-            if a.get("step_id") == pe.get("ID"):
-                assignment = a
-                break
+        assignment = assignment_by_step.get(pe.get("ID"))
 
         if not assignment:
             print(f"Warning: No assignment found for process element {pe.get('ID')}")
             continue
 
-        if "Parameters" not in pe:
-            continue
-
-        for param in pe["Parameters"]:
+        resource_key = assignment.get("resource", "")
+        resource_short = _short_resource_name(resource_key)
+
+        # (property_id, property_unit) -> [(capability_name, property_name), ...]:
+        # the first matched property of each capability detail, in order
+        matched_index = {}
+        if pe.get("Parameters"):
+            for capability_detail in assignment.get("capability_details", []):
+                seen = set()
+                for matched_prop in capability_detail.get("matched_properties", []):
+                    key = (matched_prop.get("property_id"), matched_prop.get("property_unit"))
+                    if key not in seen:
+                        seen.add(key)
+                        matched_index.setdefault(key, []).append(
+                            (capability_detail.get("capability_name", ""), matched_prop.get("property_name", ""))
+                        )
+
+        # Assign a unique ID for each parameter
+        for param in pe.get("Parameters", ()):
             param_id = None
 
             # Special handling for Dosing
             if pe.get("ID") == "Dosing001" and param.get("ID") == "Dosing_Amount001":
                 property_realized_by = find_property_realized_by(
-                    assignment.get("resource", ""),
+                    resource_key,
                     "Dosing",
                     "Litre",
                 )
                 param_id = property_realized_by
             else:
                 # Find matching property in capability_details
-                for capability_detail in assignment.get("capability_details", []):
-                    for matched_prop in capability_detail.get("matched_properties", []):
-                        if (
-                            matched_prop.get("property_id") == param.get("Key")
-                            and matched_prop.get("property_unit") == param.get("UnitOfMeasure")
-                        ):
-                            property_realized_by = find_property_realized_by(
-                                assignment.get("resource", ""),
-                                capability_detail.get("capability_name", ""),
-                                matched_prop.get("property_name", ""),
-                            )
-                            param_id = property_realized_by
-                            break
+                for capability_name, property_name in matched_index.get(
+                    (param.get("Key"), param.get("UnitOfMeasure")), ()
+                ):
+                    param_id = find_property_realized_by(resource_key, capability_name, property_name)
                     if param_id:
                         break
 
@@ -222,7 +356,6 @@ def generate_b2mml_master_recipe(
             param_elem = create_element(formula, "Parameter")
             create_element(param_elem, "ID").text = formatted_param_id
 
-            resource_short = assignment.get("resource", "").replace("resource: ", "").replace("2025-04_", "")
             param_desc = f"{resource_short}_{param.get('Description', '').replace(' ', '_')}"
             create_element(param_elem, "Description").text = param_desc
 
@@ -236,39 +369,11 @@ def generate_b2mml_master_recipe(
 
             create_element(value_elem, "ValueString").text = value_str
             create_element(value_elem, "DataInterpretation").text = "Constant"
-            create_element(value_elem, "DataType").text = map_data_type(param.get("DataType", ""))
-            create_element(value_elem, "UnitOfMeasure").text = map_unit(param.get("UnitOfMeasure", ""))
+            create_element(value_elem, "DataType").text = _map_data_type(param.get("DataType", ""))
+            create_element(value_elem, "UnitOfMeasure").text = _map_unit(param.get("UnitOfMeasure", ""))
 
             global_param_counter += 1
 
-    # ProcedureLogic
-    procedure_logic = create_element(master_recipe, "ProcedureLogic")
-
-    # Create step list
-    steps = []
-
-    # 1) Start step
-    steps.append({"id": "S1", "recipe_element_id": "Init", "description": "Init"})
-
-    # 2) Operation steps in ProcessElements order
-    step_counter = 2
-    recipe_element_counter = 1
-
-    for pe in general_recipe_data["ProcessElements"]:
-        step_id = f"S{step_counter}"
-
-        assignment = None
-        for a in optimal_solution.get("assignments", []):
-            if a.get("step_id") == pe.get("ID"):
-                assignment = a
-                break
-
-        if not assignment:
-            print(f"Warning: No assignment found for process element {pe.get('ID')}")
-            continue
-
-        resource_short = assignment.get("resource", "").replace("resource: ", "").replace("2025-04_", "")
-
         # Capability name (from assignment)
         capability_name = "Unknown"
         for cap_detail in assignment.get("capability_details", []) or []:
@@ -278,7 +383,6 @@ def generate_b2mml_master_recipe(
 
         # Find realized_by from resource data
         recipe_element_id = None
-        resource_key = assignment.get("resource", "")
         if resource_key in resources_data:
             resource_caps = resources_data[resource_key]
             if isinstance(resource_caps, list):
@@ -301,17 +405,7 @@ def generate_b2mml_master_recipe(
 
         step_description = f"{recipe_element_counter:03d}:{resource_short}_{pe.get('Description', '')}:{capability_name}"
 
-        steps.append(
-            {
-                "id": step_id,
-                "recipe_element_id": recipe_element_id,
-                "description": step_description,
-                "process_element": pe,
-                "assignment": assignment,
-                "recipe_element_number": recipe_element_counter,
-                "capability_name": capability_name,
-            }
-        )
+        add_step(step_id, recipe_element_id, step_description)
 
         # Store for later RecipeElement creation
         pe["recipe_element_id"] = recipe_element_id
@@ -322,71 +416,7 @@ def generate_b2mml_master_recipe(
         recipe_element_counter += 1
 
     # 3) End step
-    steps.append({"id": f"S{step_counter}", "recipe_element_id": "End", "description": "End"})
-
-    # Create links (Step -> Transition -> Step) sequentially
-    link_counter = 1
-    for i in range(len(steps) - 1):
-        # Step i -> Transition i+1
-        link = create_element(procedure_logic, "Link")
-        create_element(link, "ID").text = f"L{link_counter}"
-
-        from_id = create_element(link, "FromID")
-        create_element(from_id, "FromIDValue").text = steps[i]["id"]
-        create_element(from_id, "FromType").text = "Step"
-        create_element(from_id, "IDScope").text = "External"
-
-        to_id = create_element(link, "ToID")
-        create_element(to_id, "ToIDValue").text = f"T{i+1}"
-        create_element(to_id, "ToType").text = "Transition"
-        create_element(to_id, "IDScope").text = "External"
-
-        create_element(link, "LinkType").text = "ControlLink"
-        create_element(link, "Depiction").text = "LineAndArrow"
-        create_element(link, "EvaluationOrder").text = "1"
-        create_element(link, "Description").text = "string"
-
-        link_counter += 1
-
-        # Transition i+1 -> Step i+1
-        link = create_element(procedure_logic, "Link")
-        create_element(link, "ID").text = f"L{link_counter}"
-
-        from_id = create_element(link, "FromID")
-        create_element(from_id, "FromIDValue").text = f"T{i+1}"
-        create_element(from_id, "FromType").text = "Transition"
-        create_element(from_id, "IDScope").text = "External"
-
-        to_id = create_element(link, "ToID")
-        create_element(to_id, "ToIDValue").text = steps[i + 1]["id"]
-        create_element(to_id, "ToType").text = "Step"
-        create_element(to_id, "IDScope").text = "External"
-
-        create_element(link, "LinkType").text = "ControlLink"
-        create_element(link, "Depiction").text = "LineAndArrow"
-        create_element(link, "EvaluationOrder").text = "1"
-        create_element(link, "Description").text = "string"
-
-        link_counter += 1
-
-    # Create Step elements
-    for step in steps:
-        step_elem = create_element(procedure_logic, "Step")
-        create_element(step_elem, "ID").text = step["id"]
-        create_element(step_elem, "RecipeElementID").text = step["recipe_element_id"]
-        create_element(step_elem, "RecipeElementVersion")
-        create_element(step_elem, "Description").text = step["description"]
-
-    # Create Transition elements
-    for i in range(1, len(steps)):
-        transition = create_element(procedure_logic, "Transition")
-        create_element(transition, "ID").text = f"T{i}"
-
-        if i == 1:
-            create_element(transition, "Condition").text = "True"
-        else:
-            prev_step_desc = steps[i - 1]["description"]
-            create_element(transition, "Condition").text = f"Step {prev_step_desc} is Completed"
+    add_step(f"S{step_counter}", "End", "End")
 
     # RecipeElements: Begin and End
     for elem_type, elem_id in [("Begin", "Init"), ("End", "End")]:
@@ -401,11 +431,7 @@ def generate_b2mml_master_recipe(
     )
 
     for pe in recipe_elements_sorted:
-        assignment = None
-        for a in optimal_solution.get("assignments", []):
-            if a.get("step_id") == pe.get("ID"):
-                assignment = a
-                break
+        assignment = assignment_by_step.get(pe.get("ID"))
 
         if not assignment:
             continue
@@ -413,7 +439,7 @@ def generate_b2mml_master_recipe(
         recipe_elem = create_element(master_recipe, "RecipeElement")
         create_element(recipe_elem, "ID").text = pe["recipe_element_id"]
 
-        resource_short = assignment.get("resource", "").replace("resource: ", "").replace("2025-04_", "")
+        resource_short = _short_resource_name(assignment.get("resource", ""))
         capability_name = pe.get("capability_name", "Unknown")
 
         pe_name_map = {
@@ -438,29 +464,29 @@ def generate_b2mml_master_recipe(
                 create_element(param_ref, "ParameterType").text = "ProcessParameter"
 
     # --- Serialize XML (with declaration) ---
-    # Use bytes output so xml_declaration is correct and stable.
-    xml_bytes = ET.tostring(root, encoding="utf-8", xml_declaration=True)
-
-    # Pretty print
-    try:
-        dom = minidom.parseString(xml_bytes)
-        pretty_xml = dom.toprettyxml(indent="\t", encoding="utf-8").decode("utf-8")
-    except Exception as e:
-        print(f"Warning: Could not pretty-print XML: {e}")
-        pretty_xml = xml_bytes.decode("utf-8")
+    # ET.indent writes the tab indentation into the tree itself, so a plain
+    # serialisation is enough; pretty_print would only re-walk the indented
+    # tree to add the final newline
+    ET.indent(root, space="\t")
 
     # Save or return
     if output_path:
+        # Serialise to UTF-8 bytes once and hand them to the file in one write;
+        # lxml's file-object writer would call f.write() per 4 KiB chunk, and
+        # a text-mode file would re-encode a decoded copy
+        xml_bytes = ET.tostring(root, encoding="utf-8")
         try:
-            with open(output_path, "w", encoding="utf-8") as f:
-                f.write(pretty_xml)
+            with open(output_path, "wb") as f:
+                f.write(_XML_DECLARATION_BYTES)
+                f.write(xml_bytes)
+                f.write(b"\n")
             print(f"Successfully saved Master Recipe to: {output_path}")
             return output_path
         except Exception as e:
             print(f"Error saving file: {e}")
-            return pretty_xml
+            return _XML_DECLARATION + xml_bytes.decode("utf-8") + "\n"
 
-    return pretty_xml
+    return _XML_DECLARATION + ET.tostring(root, encoding="unicode") + "\n"
 
 
 def save_b2mml_xml(xml_content, filename="MasterRecipe_B2MML.xml"):
@@ -519,7 +545,7 @@ def main():
 
         print("\nResource Usage:")
         for resource, count in optimization["optimal_solution"]["resource_usage"].items():
-            resource_short = resource.replace("resource: ", "").replace("2025-04_", "")
+            resource_short = _short_resource_name(resource)
             print(f"  {resource_short}: {count} step(s)")
 
         print(f"\nTotal Energy Cost: {optimization['optimal_solution']['total_energy_cost']}")
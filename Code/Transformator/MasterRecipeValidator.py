@@ -1,5 +1,8 @@
 # Code/Transformator/MasterRecipeValidator.py
+import os
 import re
+import sys
+from functools import lru_cache
 from pathlib import Path
 from lxml import etree
 
@@ -26,6 +29,19 @@ def _guess_root_xsd(allschema_dir: str) -> str:
     return str(xsds[0]) if xsds else ""
 
 
+# Read buffer for recipe XML files
+_XML_READ_BUFFER = 16 * 1024 * 1024
+
+
+# Compiled schemas are cached per process only: etree.XMLSchema cannot be
+# pickled, and a B2MML schema set xs:imports documents from other target
+# namespaces, so it cannot be flattened into one cached XSD file either.
+@lru_cache(maxsize=8)
+def _compile_schema(root_xsd_path: str, mtime_ns: int, size: int) -> etree.XMLSchema:
+    # mtime/size are part of the key so an edited root XSD is recompiled
+    return etree.XMLSchema(etree.parse(root_xsd_path, etree.XMLParser(huge_tree=True)))
+
+
 def validate_master_recipe_xml(
     master_recipe_xml_path: str,
     allschema_dir: str,
@@ -41,13 +57,17 @@ def validate_master_recipe_xml(
         return False, [f"[XSD] No .xsd found under: {allschema_dir}"], None
 
     try:
-        xml_doc = etree.parse(str(master_recipe_xml_path))
+        # Large buffered reads instead of libxml2's small ones (slow on network
+        # drives); lxml takes the document URL for error messages from fh.name
+        with open(str(master_recipe_xml_path), "rb", buffering=_XML_READ_BUFFER) as fh:
+            xml_doc = etree.parse(fh)
     except Exception as e:
         return False, [f"[XML] Failed to parse XML: {e}"], used_root
 
     try:
-        xsd_doc = etree.parse(str(used_root))
-        schema = etree.XMLSchema(xsd_doc)
+        root = os.path.abspath(str(used_root))
+        st = os.stat(root)
+        schema = _compile_schema(root, st.st_mtime_ns, st.st_size)
     except Exception as e:
         return False, [f"[XSD] Failed to parse XSD ({used_root}): {e}"], used_root
 
@@ -70,10 +90,24 @@ _UUID_RE = re.compile(
     r"[0-9a-fA-F]{4}-"
     r"[0-9a-fA-F]{12}$"
 )
+# Unanchored form, for UUIDs embedded in longer strings
+_UUID_SEARCH_RE = re.compile(
+    r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+)
+# OPC UA NodeId GUID segment, e.g. 'ns=2;g=UUID'
+_OPCUA_GUID_RE = re.compile(r"(?:^|;)\s*g\s*=\s*([0-9a-fA-F\-]{36})\s*(?:;|$)")
+# HC resource token in a parameter description, e.g. 'HC29_...'
+_HC_TOKEN_RE = re.compile(r"(HC\d+)")
 
 
 def _is_uuid(s: str) -> bool:
-    return bool(_UUID_RE.match(s or ""))
+    # Cheap length/dash gate first; most non-UUIDs never reach the regex.
+    # 37 because '$' also matches before a trailing newline.
+    if not s or len(s) not in (36, 37):
+        return False
+    if s[8] != "-" or s[13] != "-" or s[18] != "-" or s[23] != "-":
+        return False
+    return bool(_UUID_RE.match(s))
 
 
 def _extract_uuid_from_id(raw_id: str) -> str | None:
@@ -96,10 +130,7 @@ def _extract_uuid_from_id(raw_id: str) -> str | None:
         if _is_uuid(last):
             return last
 
-    m = re.search(
-        r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}",
-        rid,
-    )
+    m = _UUID_SEARCH_RE.search(rid)
     if m:
         u = m.group(0)
         if _is_uuid(u):
@@ -126,7 +157,7 @@ def _extract_opcua_guid_from_id(raw_id: str) -> str | None:
         return u
 
     # parse 'g=' segment
-    m = re.search(r"(?:^|;)\s*g\s*=\s*([0-9a-fA-F\-]{36})\s*(?:;|$)", rid)
+    m = _OPCUA_GUID_RE.search(rid)
     if m:
         u = m.group(1).strip()
         if _is_uuid(u):
@@ -157,33 +188,52 @@ def _looks_like_uuid_index(resources_data: dict) -> bool:
 
 def _collect_uuids_anywhere(obj) -> list[str]:
     """
-    Recursively collect UUID strings from nested dict/list/str.
+    Collect UUID strings from nested dict/list/str.
+    Gathers all strings in one sweep and runs a single regex over them.
     """
-    found = set()
-
-    def walk(x):
-        if x is None:
-            return
-        if isinstance(x, str):
-            matches = re.findall(
-                r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}",
-                x,
-            )
-            for u in matches:
-                if _is_uuid(u):
-                    found.add(u)
-            return
-        if isinstance(x, dict):
-            for v in x.values():
-                walk(v)
-            return
-        if isinstance(x, (list, tuple, set)):
-            for v in x:
-                walk(v)
-            return
-
-    walk(obj)
-    return list(found)
+    strings: list[str] = []
+    add = strings.append
+    stack = [obj]
+    pop = stack.pop
+    extend = stack.extend
+    while stack:
+        x = pop()
+        # Exact type checks cover what the parsers produce; isinstance
+        # keeps subclasses (OrderedDict, str subclasses, ...) working
+        t = type(x)
+        if t is str:
+            add(x)
+        elif t is dict:
+            extend(x.values())
+        elif t is list:
+            extend(x)
+        elif isinstance(x, str):
+            add(x)
+        elif isinstance(x, dict):
+            extend(x.values())
+        elif isinstance(x, (list, tuple, set)):
+            extend(x)
+
+    if not strings:
+        return []
+    # '\n' cannot be part of a match, so strings never merge into one UUID;
+    # every match has exactly the shape _is_uuid checks
+    return list(set(_UUID_SEARCH_RE.findall("\n".join(strings))))
+
+
+# Common key variants across different parsers / formats
+_PROP_UUID_KEYS = (
+    # original keys
+    "propertyRealizedBy", "property_realized_by",
+    # capitalization / spelling variants
+    "PropertyRealizedBy", "propertyRealisedBy", "property_realised_by", "PropertyRealisedBy",
+    "realizedBy", "realisedBy",
+    # reference-ish containers (often nested)
+    "semanticId", "semanticID", "semantic_id",
+    "reference", "ref", "references",
+    "id", "ID", "identifier",
+)
+_PROP_UUID_KEY_SET = frozenset(_PROP_UUID_KEYS)
 
 
 def _extract_uuids_from_prop(prop: dict) -> list[str]:
@@ -194,25 +244,11 @@ def _extract_uuids_from_prop(prop: dict) -> list[str]:
     if not isinstance(prop, dict):
         return []
 
-    # Common key variants across different parsers / formats
-    key_candidates = [
-        # original keys
-        "propertyRealizedBy", "property_realized_by",
-        # capitalization / spelling variants
-        "PropertyRealizedBy", "propertyRealisedBy", "property_realised_by", "PropertyRealisedBy",
-        "realizedBy", "realisedBy",
-        # reference-ish containers (often nested)
-        "semanticId", "semanticID", "semantic_id",
-        "reference", "ref", "references",
-        "id", "ID", "identifier",
-    ]
-
     uuids: list[str] = []
 
-    # 1) Try candidate keys
-    for k in key_candidates:
-        if k not in prop:
-            continue
+    # 1) Try candidate keys; many props carry none, which one set check settles
+    present = () if _PROP_UUID_KEY_SET.isdisjoint(prop) else [k for k in _PROP_UUID_KEYS if k in prop]
+    for k in present:
         v = prop.get(k)
         if isinstance(v, str):
             u = _extract_uuid_from_id(v)
@@ -223,9 +259,12 @@ def _extract_uuids_from_prop(prop: dict) -> list[str]:
         else:
             uuids.extend(_collect_uuids_anywhere(v))
 
-    # 2) If still nothing, scan entire prop (more aggressive)
+    # 2) If still nothing, scan the rest of the prop (more aggressive);
+    #    the candidate keys were already scanned in full above
     if not uuids:
-        uuids = _collect_uuids_anywhere(prop)
+        uuids = _collect_uuids_anywhere(
+            [v for k, v in prop.items() if k not in _PROP_UUID_KEY_SET]
+        )
 
     # De-dup while preserving order
     deduped = []
@@ -301,6 +340,8 @@ def build_uuid_index_from_capabilities(resources_data: dict) -> tuple[dict, list
                     continue
 
                 for uuid in uuids:
+                    # One shared str per UUID for the index key and every entry
+                    uuid = sys.intern(uuid)
                     entry = {
                         "uuid": uuid,
                         "resource_key": resource_key,
@@ -336,15 +377,153 @@ def build_uuid_index_from_capabilities(resources_data: dict) -> tuple[dict, list
 # MasterRecipe Parameter Validation (HCxx preference)
 # ==========================================================
 
+def _local_name(tag) -> str:
+    return tag.rsplit('}', 1)[-1] if isinstance(tag, str) else ""
+
+
+class _FormulaParameterTarget:
+    """
+    lxml parser target collecting (Description, ID) text of the MasterRecipe
+    Formula Parameters, i.e. the selection of
+    './/{*}MasterRecipe//{*}Formula//{*}Parameter', in document order.
+
+    No element objects are built; only the two fields the validator reads
+    are kept. Field values match '(child.text or "").strip()' of the first
+    direct Description / ID child: text after the first child node of that
+    field is not part of .text and is ignored.
+    """
+
+    _FIELDS = ("Description", "ID")
+
+    def __init__(self):
+        self.ready = []          # finished (description, raw_id) pairs
+        self._pending = []       # selected Parameters of the current outermost Parameter
+        self._names = []         # open element local names; [0] is the root
+        self._params = []        # per open Parameter: its field dict, or None if not selected
+        self._formula_stack = [] # per open Formula: whether it lies inside a MasterRecipe
+        self._open_recipes = 0
+        self._open_formulas = 0
+        self._field = None       # (field dict, name) while collecting .text
+        self._buf = []
+
+    def start(self, tag, attrib, nsmap=None):
+        self._stop_text()
+        name = _local_name(tag)
+        is_root = not self._names
+        parent = self._names[-1] if self._names else None
+        self._names.append(name)
+
+        if name == "Parameter":
+            fields = {} if self._open_formulas else None
+            if fields is not None:
+                self._pending.append(fields)
+            self._params.append(fields)
+        elif name == "Formula":
+            counted = not is_root and self._open_recipes > 0
+            self._formula_stack.append(counted)
+            self._open_formulas += counted
+        elif name == "MasterRecipe":
+            if not is_root:
+                self._open_recipes += 1
+        elif name in self._FIELDS and parent == "Parameter" and self._params:
+            fields = self._params[-1]
+            if fields is not None and name not in fields:
+                fields[name] = ""
+                self._field = (fields, name)
+                self._buf = []
+
+    def end(self, tag):
+        self._stop_text()
+        name = self._names.pop()
+        if name == "Parameter":
+            self._params.pop()
+            if not self._params:
+                # Outermost Parameter closed: its selected Parameters are complete
+                self.ready.extend(
+                    (f.get("Description", ""), f.get("ID", "")) for f in self._pending
+                )
+                self._pending.clear()
+        elif name == "Formula":
+            self._open_formulas -= self._formula_stack.pop()
+        elif name == "MasterRecipe":
+            if self._names:
+                self._open_recipes -= 1
+
+    def data(self, text):
+        if self._field is not None:
+            self._buf.append(text)
+
+    # Comments and PIs are child nodes in a tree, so they end .text as well
+    def comment(self, text):
+        self._stop_text()
+
+    def pi(self, target, data=None):
+        self._stop_text()
+
+    def close(self):
+        return None
+
+    def _stop_text(self):
+        if self._field is not None:
+            fields, name = self._field
+            fields[name] = "".join(self._buf).strip()
+            self._field = None
+            self._buf = []
+
+
+# Bytes fed to the parser per step; results are handed out between steps
+_PARSE_CHUNK_SIZE = 1024 * 1024
+
+
+def _iter_formula_parameters(master_recipe_xml_path: str):
+    """
+    Stream (description, raw_id) of the MasterRecipe Formula Parameters in
+    document order. The recipe is fed to the parser in chunks and no tree
+    is built, so memory stays flat for large recipes.
+    """
+    target = _FormulaParameterTarget()
+    parser = etree.XMLParser(target=target, recover=True, huge_tree=True)
+    with open(str(master_recipe_xml_path), "rb") as fh:
+        while True:
+            chunk = fh.read(_PARSE_CHUNK_SIZE)
+            if not chunk:
+                break
+            parser.feed(chunk)
+            if target.ready:
+                yield from target.ready
+                target.ready.clear()
+    parser.close()
+    yield from target.ready
+
+
+def _pick_hc_candidate(cands: list, expected_hc: str):
+    """Candidate belonging to resource HCxx, or None."""
+    # 1) Prefer resource_key containing the HC token (e.g. "..._HC29")
+    for c in cands:
+        rk = (c.get("resource_key") or "")
+        if expected_hc in str(rk):
+            return c
+    # 2) Or the derived resource name equals HCxx
+    for c in cands:
+        if (c.get("resource") or "").strip() == expected_hc:
+            return c
+    return None
+
+
 def validate_master_recipe_parameters(
     master_recipe_xml_path: str,
     resources_data: dict,
-    id_format: str = "opcua"
+    id_format: str = "opcua",
+    precomputed_index: tuple[dict, list[str]] | None = None
 ):
     """
     Returns:
       ok(bool), errors(list[str]), warnings(list[str]), checked(int), details(list[dict])
 
+    precomputed_index:
+      Optional (uuid_index, warnings) from build_uuid_index_from_capabilities for the
+      same resources_data, so repeated validations skip rebuilding the index.
+
     Validation:
       - Extract UUID from Parameter/ID (uuid / prefix:uuid / OPC UA g=uuid)
       - UUID must exist in uuid_index built from capabilities
@@ -353,12 +532,10 @@ def validate_master_recipe_parameters(
       If UUID has multiple candidates, prefer candidate whose resource_key/resource matches HC token
       extracted from Description (e.g. 'HC29_...').
     """
-    parser = etree.XMLParser(remove_blank_text=True, recover=True, huge_tree=True)
-    doc = etree.parse(str(master_recipe_xml_path), parser)
-
-    params = doc.findall('.//{*}MasterRecipe//{*}Formula//{*}Parameter')
-
-    uuid_index, idx_warnings = build_uuid_index_from_capabilities(resources_data)
+    if precomputed_index is not None:
+        uuid_index, idx_warnings = precomputed_index
+    else:
+        uuid_index, idx_warnings = build_uuid_index_from_capabilities(resources_data)
 
     errors: list[str] = []
     warnings: list[str] = []
@@ -366,18 +543,17 @@ def validate_master_recipe_parameters(
 
     details: list[dict] = []
     checked = 0
+    hc_picks: dict = {}
 
-    for p in params:
-        desc_el = p.find('./{*}Description')
-        desc = (desc_el.text or "").strip() if desc_el is not None else ""
+    # The ID format is fixed for the whole call; pick the extractor once
+    if id_format.lower() in {"opcua", "opcua_guid", "opcua-nodeid"}:
+        extract_uuid = _extract_opcua_guid_from_id
+    else:
+        extract_uuid = _extract_uuid_from_id
 
-        id_el = p.find('./{*}ID')
-        raw_id = (id_el.text or "").strip() if id_el is not None else ""
-
-        if id_format.lower() in {"opcua", "opcua_guid", "opcua-nodeid"}:
-            uuid = _extract_opcua_guid_from_id(raw_id)
-        else:
-            uuid = _extract_uuid_from_id(raw_id)
+    for desc, raw_id in _iter_formula_parameters(master_recipe_xml_path):
+        # An empty ID can never carry a UUID; report it without parsing
+        uuid = extract_uuid(raw_id) if raw_id else None
 
         checked += 1
 
@@ -390,7 +566,8 @@ def validate_master_recipe_parameters(
             })
             continue
 
-        if uuid not in uuid_index:
+        cands = uuid_index.get(uuid)
+        if cands is None:
             errors.append(f"[UNKNOWN-UUID] {uuid} ({desc})")
             details.append({
                 "status": "UNKNOWN_UUID",
@@ -399,39 +576,36 @@ def validate_master_recipe_parameters(
             })
             continue
 
-        cands = uuid_index[uuid]
         if isinstance(cands, dict):
             cands = [cands]
 
-        # IMPORTANT: works for "HC29_..." (no \b word-boundary)
-        m = re.search(r"(HC\d+)", desc or "")
-        expected_hc = m.group(1) if m else None
-
-        hit = None
-        if expected_hc:
-            # 1) Prefer resource_key containing the HC token (e.g. "..._HC29")
-            for c in cands:
-                rk = (c.get("resource_key") or "")
-                if expected_hc in str(rk):
-                    hit = c
-                    break
-            # 2) Or the derived resource name equals HCxx
-            if hit is None:
-                for c in cands:
-                    if (c.get("resource") or "").strip() == expected_hc:
-                        hit = c
-                        break
+        # A single candidate is the answer whatever the HC token says
+        if len(cands) == 1:
+            hit = cands[0]
+        else:
+            # IMPORTANT: works for "HC29_..." (no \b word-boundary)
+            m = _HC_TOKEN_RE.search(desc or "")
+            expected_hc = m.group(1) if m else None
+
+            # The pick only depends on (uuid, HC token); parameters sharing a
+            # property reuse it instead of rescanning the candidates
+            pick_key = (uuid, expected_hc)
+            if pick_key in hc_picks:
+                hit = hc_picks[pick_key]
+            else:
+                hit = _pick_hc_candidate(cands, expected_hc) if expected_hc else None
+                hc_picks[pick_key] = hit
 
             # If multiple candidates exist but none match expected HC, log a hint
-            if hit is None and len(cands) > 1:
+            if hit is None and expected_hc:
                 cand_keys = [str(c.get("resource_key")) for c in cands]
                 warnings.append(
                     f"[HC-PREF] {desc}: expected {expected_hc}, but candidates are: {cand_keys}"
                 )
 
-        # 3) Fallback: first candidate
-        if hit is None:
-            hit = cands[0]
+            # 3) Fallback: first candidate
+            if hit is None:
+                hit = cands[0]
 
         details.append({
             "status": "FOUND",
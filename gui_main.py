@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 import sys
 import os
+import multiprocessing
 
 # ---------------------------------------------------------
 # [CRITICAL FIX] Bundle Startup Fixes
@@ -65,6 +66,8 @@ class MainWindow(FluentWindow):
         self.log_page.append_log(msg)
 
 if __name__ == "__main__":
+    # Resource parsing uses a process pool; frozen builds need this in the child
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     w = MainWindow()
     w.show()